@@ -1,7 +1,20 @@
 """Todo 应用 - 一个简单的命令行待办事项管理工具。"""
 
-from .models import Todo, Priority
-from .manager import TodoManager
-from .storage import JsonStorage
+import importlib
+
+# 公开对象按需导入，仅运行 CLI 帮助等路径时无需加载全部子模块
+_LAZY_IMPORTS = {
+    "Todo": ".models",
+    "Priority": ".models",
+    "TodoManager": ".manager",
+    "JsonStorage": ".storage",
+}
 
 __all__ = ["Todo", "Priority", "TodoManager", "JsonStorage"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
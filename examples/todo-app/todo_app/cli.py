@@ -2,14 +2,20 @@
 
 import argparse
 import sys
+from functools import lru_cache
 from typing import Optional
 
-from .manager import TodoManager
-from .models import Priority
+# 优先级显示文本，按枚举值索引以免在模块加载时导入 models
+_PRIORITY_LABELS = {
+    "high": "高 🔴",
+    "medium": "中 🟡",
+    "low": "低 🟢",
+}
 
 
+@lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
-    """创建命令行解析器。"""
+    """创建命令行解析器（解析器可复用，仅构建一次）。"""
     parser = argparse.ArgumentParser(
         prog="todo",
         description="简单的命令行待办事项管理工具",
@@ -58,23 +64,25 @@ def create_parser() -> argparse.ArgumentParser:
 
 def print_todo_detail(todo) -> None:
     """打印待办详情。"""
+    from .models import format_timestamp
+
     status = "已完成 ✓" if todo.completed else "进行中 ○"
-    priority_text = {
-        Priority.HIGH: "高 🔴",
-        Priority.MEDIUM: "中 🟡",
-        Priority.LOW: "低 🟢",
-    }
-
-    print(f"\n{'─' * 40}")
-    print(f"ID:       {todo.id}")
-    print(f"标题:     {todo.title}")
-    if todo.description:
-        print(f"描述:     {todo.description}")
-    print(f"状态:     {status}")
-    print(f"优先级:   {priority_text.get(todo.priority, todo.priority.value)}")
-    print(f"创建时间: {todo.created_at}")
-    print(f"更新时间: {todo.updated_at}")
-    print(f"{'─' * 40}\n")
+    priority = todo.priority.value
+
+    description = f"描述:     {todo.description}\n" if todo.description else ""
+
+    # 拼接为单个字符串后一次性输出，减少写调用次数
+    print(
+        f"\n{'─' * 40}\n"
+        f"ID:       {todo.id}\n"
+        f"标题:     {todo.title}\n"
+        f"{description}"
+        f"状态:     {status}\n"
+        f"优先级:   {_PRIORITY_LABELS.get(priority, priority)}\n"
+        f"创建时间: {format_timestamp(todo.created_at)}\n"
+        f"更新时间: {format_timestamp(todo.updated_at)}\n"
+        f"{'─' * 40}\n"
+    )
 
 
 def run_cli(args: Optional[list] = None) -> int:
@@ -93,64 +101,66 @@ def run_cli(args: Optional[list] = None) -> int:
         parser.print_help()
         return 0
 
-    manager = TodoManager()
-
-    if parsed.command == "add":
-        todo = manager.add(
-            title=parsed.title,
-            description=parsed.description,
-            priority=parsed.priority,
-        )
-        print(f"✓ 已添加: {todo}")
-
-    elif parsed.command in ("list", "ls"):
-        todos = manager.list(show_completed=parsed.all)
-        if not todos:
-            print("没有待办事项。")
-        else:
-            print(f"\n{'待办列表':^40}")
-            print("─" * 40)
-            for todo in todos:
-                print(f"  {todo}")
-            print("─" * 40)
+    # 延迟导入：仅在需要访问数据时加载管理器和存储层
+    from .manager import TodoManager
+
+    # 批量模式：命令执行期间的修改在退出 with 块时统一写入一次
+    with TodoManager(auto_save=False) as manager:
+        if parsed.command == "add":
+            todo = manager.add(
+                title=parsed.title,
+                description=parsed.description,
+                priority=parsed.priority,
+            )
+            print(f"✓ 已添加: {todo}")
+
+        elif parsed.command in ("list", "ls"):
+            todos = manager.list(show_completed=parsed.all)
+            if not todos:
+                print("没有待办事项。")
+            else:
+                stats = manager.stats
+                lines = [f"\n{'待办列表':^40}", "─" * 40]
+                lines.extend(f"  {todo}" for todo in todos)
+                lines.append("─" * 40)
+                lines.append(f"  共 {stats['total']} 项，已完成 {stats['completed']} 项\n")
+                print("\n".join(lines))
+
+        elif parsed.command in ("complete", "done"):
+            todo = manager.complete(parsed.id)
+            if todo:
+                print(f"✓ 已完成: {todo}")
+            else:
+                print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
+                return 1
+
+        elif parsed.command in ("remove", "rm"):
+            if manager.remove(parsed.id):
+                print(f"✓ 已删除 ID: {parsed.id}")
+            else:
+                print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
+                return 1
+
+        elif parsed.command == "show":
+            todo = manager.get(parsed.id)
+            if todo:
+                print_todo_detail(todo)
+            else:
+                print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
+                return 1
+
+        elif parsed.command == "stats":
             stats = manager.stats
-            print(f"  共 {stats['total']} 项，已完成 {stats['completed']} 项\n")
-
-    elif parsed.command in ("complete", "done"):
-        todo = manager.complete(parsed.id)
-        if todo:
-            print(f"✓ 已完成: {todo}")
-        else:
-            print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
-            return 1
-
-    elif parsed.command in ("remove", "rm"):
-        if manager.remove(parsed.id):
-            print(f"✓ 已删除 ID: {parsed.id}")
-        else:
-            print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
-            return 1
-
-    elif parsed.command == "show":
-        todo = manager.get(parsed.id)
-        if todo:
-            print_todo_detail(todo)
-        else:
-            print(f"✗ 未找到 ID 为 '{parsed.id}' 的待办")
-            return 1
-
-    elif parsed.command == "stats":
-        stats = manager.stats
-        print(f"\n📊 统计信息")
-        print(f"─" * 20)
-        print(f"  总计:   {stats['total']}")
-        print(f"  待完成: {stats['pending']}")
-        print(f"  已完成: {stats['completed']}")
-        print()
-
-    elif parsed.command == "clear":
-        count = manager.clear_completed()
-        print(f"✓ 已清除 {count} 个已完成的待办")
+            print(f"\n📊 统计信息")
+            print(f"─" * 20)
+            print(f"  总计:   {stats['total']}")
+            print(f"  待完成: {stats['pending']}")
+            print(f"  已完成: {stats['completed']}")
+            print()
+
+        elif parsed.command == "clear":
+            count = manager.clear_completed()
+            print(f"✓ 已清除 {count} 个已完成的待办")
 
     return 0
 
@@ -1,6 +1,6 @@
 """Todo 管理器 - 处理 CRUD 操作。"""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .models import Todo, Priority
 from .storage import JsonStorage
@@ -9,23 +9,51 @@ from .storage import JsonStorage
 class TodoManager:
     """待办管理器。"""
 
-    def __init__(self, storage: Optional[JsonStorage] = None):
+    def __init__(self, storage: Optional[JsonStorage] = None, auto_save: bool = True):
         """初始化管理器。
 
         Args:
             storage: 存储实例，默认使用 JsonStorage
+            auto_save: 是否在每次修改后立即保存；为 False 时需调用 flush()
+                或使用 with 语句在退出时统一保存
         """
         self.storage = storage or JsonStorage()
-        self._todos: List[Todo] = []
+        self.auto_save = auto_save
+        # 以 ID 为键存储待办，字典保持插入顺序
+        self._todos: Dict[str, Todo] = {}
+        # 未完成待办的索引，与 _todos 保持相同的相对顺序
+        self._pending: Dict[str, Todo] = {}
+        self._dirty = False
         self._load()
 
+    def __enter__(self) -> "TodoManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+
     def _load(self) -> None:
         """从存储加载数据。"""
-        self._todos = self.storage.load()
+        self._todos = {t.id: t for t in self.storage.load()}
+        self._rebuild_pending()
+
+    def _rebuild_pending(self) -> None:
+        """重建未完成待办索引。"""
+        self._pending = {
+            todo_id: t for todo_id, t in self._todos.items() if not t.completed
+        }
 
     def _save(self) -> None:
-        """保存数据到存储。"""
-        self.storage.save(self._todos)
+        """标记数据已修改，自动保存模式下立即写入存储。"""
+        self._dirty = True
+        if self.auto_save:
+            self.flush()
+
+    def flush(self) -> None:
+        """将未保存的修改写入存储。"""
+        if self._dirty:
+            self.storage.save(list(self._todos.values()))
+            self._dirty = False
 
     def add(
         self,
@@ -48,7 +76,8 @@ class TodoManager:
             description=description,
             priority=Priority(priority),
         )
-        self._todos.append(todo)
+        self._todos[todo.id] = todo
+        self._pending[todo.id] = todo
         self._save()
         return todo
 
@@ -62,8 +91,8 @@ class TodoManager:
             待办列表
         """
         if show_completed:
-            return self._todos
-        return [t for t in self._todos if not t.completed]
+            return list(self._todos.values())
+        return list(self._pending.values())
 
     def get(self, todo_id: str) -> Optional[Todo]:
         """获取单个待办。
@@ -74,9 +103,13 @@ class TodoManager:
         Returns:
             Todo 或 None
         """
-        for todo in self._todos:
-            if todo.id == todo_id or todo.id.startswith(todo_id):
-                return todo
+        todo = self._todos.get(todo_id)
+        if todo is not None:
+            return todo
+        # 未精确命中时按前缀匹配，只遍历 ID 键而不访问 Todo 对象
+        for key in self._todos:
+            if key.startswith(todo_id):
+                return self._todos[key]
         return None
 
     def complete(self, todo_id: str) -> Optional[Todo]:
@@ -90,6 +123,7 @@ class TodoManager:
         """
         todo = self.get(todo_id)
         if todo:
+            self._pending.pop(todo.id, None)
             todo.mark_complete()
             self._save()
         return todo
@@ -105,7 +139,8 @@ class TodoManager:
         """
         todo = self.get(todo_id)
         if todo:
-            self._todos.remove(todo)
+            del self._todos[todo.id]
+            self._pending.pop(todo.id, None)
             self._save()
             return True
         return False
@@ -122,7 +157,13 @@ class TodoManager:
         """
         todo = self.get(todo_id)
         if todo:
+            was_completed = todo.completed
             todo.update(**kwargs)
+            if todo.completed:
+                self._pending.pop(todo.id, None)
+            elif was_completed:
+                # 重新变为未完成时重建索引以保持原有顺序
+                self._rebuild_pending()
             self._save()
         return todo
 
@@ -133,7 +174,7 @@ class TodoManager:
             删除的数量
         """
         original_count = len(self._todos)
-        self._todos = [t for t in self._todos if not t.completed]
+        self._todos = dict(self._pending)
         self._save()
         return original_count - len(self._todos)
 
@@ -141,9 +182,9 @@ class TodoManager:
     def stats(self) -> dict:
         """获取统计信息。"""
         total = len(self._todos)
-        completed = sum(1 for t in self._todos if t.completed)
+        pending = len(self._pending)
         return {
             "total": total,
-            "completed": completed,
-            "pending": total - completed,
+            "completed": total - pending,
+            "pending": pending,
         }
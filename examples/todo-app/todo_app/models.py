@@ -1,10 +1,14 @@
 """Todo 数据模型。"""
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
-from typing import Optional
-import uuid
+from functools import lru_cache
+from numbers import Real
+from typing import Optional, Union
+import os
+import time
 
 
 class Priority(Enum):
@@ -14,36 +18,107 @@ class Priority(Enum):
     LOW = "low"
 
 
-@dataclass
+def _now() -> int:
+    """返回当前 Unix 时间戳（秒）。"""
+    return int(time.time())
+
+
+def _new_id() -> str:
+    """生成 8 位十六进制短 ID。"""
+    return os.urandom(4).hex()
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(ts: int) -> str:
+    """将 Unix 时间戳格式化为本地时间的 ISO 字符串。"""
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+
+
+def _parse_timestamp(value: Union[Real, Decimal, str, None]) -> int:
+    """解析存储中的时间戳，兼容旧版 ISO 字符串格式；无法解析时取当前时间。"""
+    if isinstance(value, int):
+        return value
+    try:
+        if isinstance(value, (Real, Decimal)):
+            # 手动编辑的小数，或 ijson 流式解析得到的 Decimal
+            return int(value)
+        if value:
+            return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return _now()
+
+
+# 优先级值到枚举的映射，避免 Enum.__call__ 的查找开销
+_PRIORITY_MAP = {p.value: p for p in Priority}
+
+# 存储格式中优先级使用整数序号（0=high, 1=medium, 2=low）
+_PRIORITY_BY_INT = dict(enumerate(Priority))
+_PRIORITY_TO_INT = {p: i for i, p in _PRIORITY_BY_INT.items()}
+
+# 优先级图标（模块级缓存，避免每次格式化时重建字典）
+_PRIORITY_ICONS = {
+    Priority.HIGH: "🔴",
+    Priority.MEDIUM: "🟡",
+    Priority.LOW: "🟢",
+}
+
+
+@dataclass(slots=True)
 class Todo:
     """待办事项模型。"""
 
     title: str
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=_new_id)
     description: Optional[str] = None
     completed: bool = False
     priority: Priority = Priority.MEDIUM
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: int = 0
+    updated_at: int = 0
+
+    def __post_init__(self) -> None:
+        """填充未指定的时间戳，新建时两者只取一次当前时间。"""
+        if not self.created_at:
+            self.created_at = _now()
+        if not self.updated_at:
+            self.updated_at = self.created_at
 
     def to_dict(self) -> dict:
         """转换为字典。"""
-        data = asdict(self)
-        data["priority"] = self.priority.value
-        return data
+        return {
+            "title": self.title,
+            "id": self.id,
+            "description": self.description,
+            "completed": self.completed,
+            "priority": _PRIORITY_TO_INT[self.priority],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Todo":
         """从字典创建 Todo。"""
-        data = data.copy()
-        if isinstance(data.get("priority"), str):
-            data["priority"] = Priority(data["priority"])
-        return cls(**data)
+        priority = data.get("priority", Priority.MEDIUM)
+        if isinstance(priority, int):
+            priority = _PRIORITY_BY_INT[priority]
+        elif isinstance(priority, str):
+            # 兼容旧版字符串格式，下次保存时转换为整数
+            priority = _PRIORITY_MAP[priority]
+        # 绕过 __init__，直接填充字段
+        todo = cls.__new__(cls)
+        todo.id = data["id"]
+        todo.title = data["title"]
+        todo.description = data.get("description")
+        todo.completed = data.get("completed", False)
+        todo.priority = priority
+        todo.created_at = _parse_timestamp(data.get("created_at"))
+        todo.updated_at = _parse_timestamp(data.get("updated_at") or todo.created_at)
+        return todo
 
     def mark_complete(self) -> None:
         """标记为完成。"""
         self.completed = True
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = _now()
 
     def update(self, **kwargs) -> None:
         """更新字段。"""
@@ -52,15 +127,10 @@ class Todo:
                 if key == "priority" and isinstance(value, str):
                     value = Priority(value)
                 setattr(self, key, value)
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = _now()
 
     def __str__(self) -> str:
         """格式化输出。"""
         status = "✓" if self.completed else "○"
-        priority_icons = {
-            Priority.HIGH: "🔴",
-            Priority.MEDIUM: "🟡",
-            Priority.LOW: "🟢",
-        }
-        icon = priority_icons.get(self.priority, "")
+        icon = _PRIORITY_ICONS.get(self.priority, "")
         return f"[{self.id}] {status} {icon} {self.title}"
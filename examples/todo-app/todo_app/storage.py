@@ -1,11 +1,33 @@
 """JSON 文件存储。"""
 
 import json
+import mmap
+import os
 from pathlib import Path
 from typing import List
 
 from .models import Todo
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 为可选依赖，缺失时大文件仍整体解析
+    ijson = None
+
+# 超过该大小的文件通过 mmap 读取，避免额外的读缓冲区拷贝
+_MMAP_THRESHOLD = 64 * 1024
+
+# 超过该大小且安装了 ijson 时逐条流式解析，避免整个数组常驻内存
+_STREAM_THRESHOLD = 10 * 1024 * 1024
+
+_LOAD_ERRORS = (json.JSONDecodeError, KeyError)
+if ijson is not None:
+    _LOAD_ERRORS += (ijson.JSONError,)
+
 
 class JsonStorage:
     """JSON 文件存储类。"""
@@ -28,13 +50,35 @@ class JsonStorage:
             return []
 
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return [Todo.from_dict(item) for item in data]
-        except (json.JSONDecodeError, KeyError) as e:
+            size = self.file_path.stat().st_size
+            if ijson is not None and size > _STREAM_THRESHOLD:
+                return self._load_stream()
+            if size > _MMAP_THRESHOLD:
+                data = self._load_mmap()
+            elif orjson is not None:
+                data = orjson.loads(self.file_path.read_bytes())
+            else:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            return [Todo.from_dict(item) for item in data]
+        except _LOAD_ERRORS as e:
             print(f"警告: 加载数据失败 - {e}")
             return []
 
+    def _load_stream(self) -> List[Todo]:
+        """逐条流式解析超大文件，每次只保留一个待办的字典。"""
+        with open(self.file_path, "rb") as f:
+            return [Todo.from_dict(item) for item in ijson.items(f, "item")]
+
+    def _load_mmap(self) -> list:
+        """通过内存映射解析大文件。"""
+        with open(self.file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
     def save(self, todos: List[Todo]) -> None:
         """保存所有待办。
 
@@ -42,8 +86,16 @@ class JsonStorage:
             todos: 待办列表
         """
         data = [todo.to_dict() for todo in todos]
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+        # 先写临时文件再原子替换，避免写入中断时损坏原文件
+        tmp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.file_path)
 
     def clear(self) -> None:
         """清空存储。"""
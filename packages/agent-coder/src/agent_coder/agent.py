@@ -13,71 +13,65 @@ from claude_agent_sdk import create_sdk_mcp_server, tool
 
 from .config import AgentCoderConfig
 from .prompts import CODING_ASSISTANT_PROMPT, get_prompt
-from .tools import (
-    analyze_code,
-    explain_code,
-    generate_tests,
-    refactor_code,
-    git_commit,
-    git_diff,
-    git_status,
-    create_project,
-    add_dependency,
-    list_structure,
-)
+from . import tools
 
 
-# Wrap tools for MCP server
+# Wrap tools for MCP server; tool modules load on first call via tools.__getattr__
 @tool("agent_coder_analyze_code", "Analyze code structure and quality", {"file_path": str})
 async def _analyze_code(args: dict) -> dict:
-    return analyze_code(args)
+    return tools.analyze_code(args)
 
 
 @tool("agent_coder_explain_code", "Explain code functionality", {"file_path": str, "focus": str})
 async def _explain_code(args: dict) -> dict:
-    return explain_code(args)
+    return tools.explain_code(args)
 
 
 @tool("agent_coder_refactor_code", "Suggest code refactoring improvements", {"file_path": str})
 async def _refactor_code(args: dict) -> dict:
-    return refactor_code(args)
+    return tools.refactor_code(args)
 
 
 @tool("agent_coder_generate_tests", "Generate unit test suggestions", {"file_path": str})
 async def _generate_tests(args: dict) -> dict:
-    return generate_tests(args)
+    return tools.generate_tests(args)
 
 
 @tool("agent_coder_git_status", "Get git status with context", {"path": str})
 async def _git_status(args: dict) -> dict:
-    return git_status(args)
+    return tools.git_status(args)
+
+
+@tool("agent_coder_git_status_batch", "Get git status for several paths at once", {"paths": list})
+async def _git_status_batch(args: dict) -> dict:
+    return tools.git_status_batch(args)
 
 
 @tool("agent_coder_git_commit", "Create a git commit", {"message": str, "add_all": bool, "path": str})
 async def _git_commit(args: dict) -> dict:
-    return git_commit(args)
+    return tools.git_commit(args)
 
 
 @tool("agent_coder_git_diff", "Get git diff summary", {"path": str, "staged": bool, "file": str})
 async def _git_diff(args: dict) -> dict:
-    return git_diff(args)
+    return tools.git_diff(args)
 
 
 @tool("agent_coder_create_project", "Create a new project structure",
       {"project_name": str, "project_type": str, "path": str})
 async def _create_project(args: dict) -> dict:
-    return create_project(args)
+    return tools.create_project(args)
 
 
 @tool("agent_coder_add_dependency", "Add a dependency to the project",
       {"package": str, "dev": bool})
 async def _add_dependency(args: dict) -> dict:
-    return add_dependency(args)
+    return tools.add_dependency(args)
 
 
 @tool("agent_coder_list_structure", "List project structure", {"path": str, "max_depth": int})
 async def _list_structure(args: dict) -> dict:
-    return list_structure(args)
+    return tools.list_structure(args)
 
 
 # Create the MCP server with all custom tools
@@ -90,6 +84,7 @@ _agent_coder_server = create_sdk_mcp_server(
         _refactor_code,
         _generate_tests,
         _git_status,
+        _git_status_batch,
         _git_commit,
         _git_diff,
         _create_project,
@@ -132,6 +127,7 @@ class AgentCoder:
             "mcp__agent_coder__agent_coder_refactor_code",
             "mcp__agent_coder__agent_coder_generate_tests",
             "mcp__agent_coder__agent_coder_git_status",
+            "mcp__agent_coder__agent_coder_git_status_batch",
             "mcp__agent_coder__agent_coder_git_commit",
             "mcp__agent_coder__agent_coder_git_diff",
             "mcp__agent_coder__agent_coder_create_project",
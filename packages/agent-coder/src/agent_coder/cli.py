@@ -5,8 +5,9 @@ Provides both interactive mode and single-shot task execution.
 """
 
 import asyncio
-import gc
+import atexit
 import sys
+import time
 from typing import NoReturn
 
 import click
@@ -15,6 +16,36 @@ from claude_agent_sdk._errors import CLIConnectionError
 from . import AgentCoder, AgentCoderConfig, __version__
 
 
+# Streamed text chunks are written without flushing; stdout is flushed after
+# this many chunks or this many seconds, whichever comes first.
+_FLUSH_EVERY = 16
+_FLUSH_INTERVAL = 0.02
+
+_unflushed_writes = 0
+_last_flush = 0.0
+# Flush scheduled on the running loop for text held back by _write_text
+_idle_flush: asyncio.TimerHandle | None = None
+
+# Looked up at exit, in case sys.stdout has been replaced since import
+atexit.register(lambda: sys.stdout.flush())
+
+# Pre-encoded ANSI segments for tool-use / error lines in _print_message
+_TOOL_USE_OPEN = b"\033[90m[using "
+_TOOL_USE_CLOSE = b"]\033[0m\n"
+_ERROR_OPEN = b"\033[91m[error]\033[0m "
+_NEWLINE = b"\n"
+
+
+# Shared by the per-file subcommands: caps how many agent requests run at once
+_concurrency_option = click.option(
+    "--concurrency", "-j",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Maximum number of files processed concurrently",
+    show_default=True,
+)
+
+
 @click.group(invoke_without_command=True)
 @click.version_option(version=__version__)
 @click.option(
@@ -102,29 +133,12 @@ def run(ctx, prompt, stream) -> None:
                 raise ExceptionGroup("errors", non_connection_errors)
             # 仅有 CLIConnectionError 表示关闭时的竞态条件，可以忽略
         finally:
+            _flush_text()
             await agent.close()
 
-    # 使用自定义事件循环来正确清理子进程
-    loop = asyncio.new_event_loop()
-    try:
-        loop.run_until_complete(_run())
-    finally:
-        # 清理待处理的任务和子进程
-        try:
-            # 取消所有待处理任务
-            pending = asyncio.all_tasks(loop)
-            for task in pending:
-                task.cancel()
-            if pending:
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            # 关闭异步生成器
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            # 关闭默认执行器
-            loop.run_until_complete(loop.shutdown_default_executor())
-        finally:
-            loop.close()
-        # 强制垃圾回收以在事件循环关闭前清理子进程
-        gc.collect()
+    # asyncio.Runner 退出时会取消剩余任务、关闭异步生成器和默认执行器
+    with asyncio.Runner() as runner:
+        runner.run(_run())
 
 
 @cli.command()
@@ -143,13 +157,20 @@ def interactive(ctx, prompt) -> None:
     config = ctx.obj["config"]
 
     async def _interactive() -> NoReturn:
+        # Imported here so other subcommands don't pay for prompt_toolkit
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.formatted_text import ANSI
+
         agent = AgentCoder(config=config)
+        session = PromptSession()
 
-        # Print welcome message
-        click.echo(f"\n  agent-coder v{__version__}")
-        click.echo(f"  Model: {config.model}")
-        click.echo(f"  Working directory: {config.working_dir.absolute()}")
-        click.echo("\n  Type 'exit' or 'quit' to end the session\n")
+        # Print welcome message in a single write
+        click.echo(
+            f"\n  agent-coder v{__version__}\n"
+            f"  Model: {config.model}\n"
+            f"  Working directory: {config.working_dir.absolute()}\n"
+            "\n  Type 'exit' or 'quit' to end the session\n"
+        )
 
         try:
             # Send initial prompt if provided
@@ -162,7 +183,9 @@ def interactive(ctx, prompt) -> None:
             # Main interaction loop
             while True:
                 try:
-                    user_input = input("\033[92mYou:\033[0m ").strip()
+                    # Flush buffered streamed text before prompt_toolkit takes the terminal
+                    _flush_text()
+                    user_input = (await session.prompt_async(ANSI("\033[92mYou:\033[0m "))).strip()
 
                     if user_input.lower() in {"exit", "quit", ":q"}:
                         click.echo("\nGoodbye!")
@@ -191,70 +214,158 @@ def interactive(ctx, prompt) -> None:
 
 
 @cli.command()
-@click.argument("file_path", type=click.Path(exists=True))
+@click.argument("file_paths", nargs=-1, required=True, type=click.Path(exists=True))
+@_concurrency_option
 @click.pass_context
-def analyze(ctx, file_path) -> None:
-    """Analyze a code file and show insights."""
+def analyze(ctx, file_paths, concurrency) -> None:
+    """Analyze code files and show insights."""
     config = ctx.obj["config"]
+    prompts = [
+        f"Analyze this file: {file_path}. Explain its structure, patterns, and any potential improvements."
+        for file_path in file_paths
+    ]
+    asyncio.run(_run_prompts(config, prompts, concurrency, file_paths))
 
-    async def _analyze() -> None:
-        agent = AgentCoder(config=config)
-        prompt = f"Analyze this file: {file_path}. Explain its structure, patterns, and any potential improvements."
-        messages = await agent.run(prompt)
-        for message in messages:
-            _print_message(message)
-        await agent.close()
 
-    asyncio.run(_analyze())
+@cli.command()
+@click.argument("file_paths", nargs=-1, required=True, type=click.Path(exists=True))
+@_concurrency_option
+@click.pass_context
+def explain(ctx, file_paths, concurrency) -> None:
+    """Explain what code files do."""
+    config = ctx.obj["config"]
+    prompts = [
+        f"Explain this code file: {file_path}. What does it do?"
+        for file_path in file_paths
+    ]
+    asyncio.run(_run_prompts(config, prompts, concurrency, file_paths))
 
 
 @cli.command()
-@click.argument("file_path", type=click.Path(exists=True))
+@click.argument("file_paths", nargs=-1, required=True, type=click.Path(exists=True))
+@_concurrency_option
 @click.pass_context
-def explain(ctx, file_path) -> None:
-    """Explain what a code file does."""
+def test(ctx, file_paths, concurrency) -> None:
+    """Generate unit tests for code files."""
     config = ctx.obj["config"]
+    prompts = [
+        f"Generate comprehensive unit tests for: {file_path}"
+        for file_path in file_paths
+    ]
+    asyncio.run(_run_prompts(config, prompts, concurrency, file_paths))
+
+
+async def _run_prompts(
+    config: AgentCoderConfig,
+    prompts: list[str],
+    concurrency: int,
+    file_paths: tuple[str, ...] = (),
+) -> None:
+    """
+    Run independent prompts through one shared agent and print the results.
 
-    async def _explain() -> None:
-        agent = AgentCoder(config=config)
-        prompt = f"Explain this code file: {file_path}. What does it do?"
-        messages = await agent.run(prompt)
-        for message in messages:
-            _print_message(message)
-        await agent.close()
+    At most ``concurrency`` requests are in flight at once; output is printed
+    in prompt order after all of them have finished. ``file_paths`` are read
+    in background threads meanwhile, so the tools find them already cached.
+    """
+    from .tools.code_tools import read_files
 
-    asyncio.run(_explain())
+    prefetch = asyncio.create_task(read_files(file_paths))
+    agent = AgentCoder(config=config)
+    semaphore = asyncio.Semaphore(concurrency)
 
+    async def _run_one(prompt: str) -> list[dict]:
+        async with semaphore:
+            return await agent.run(prompt)
 
-@cli.command()
-@click.argument("file_path", type=click.Path(exists=True))
-@click.pass_context
-def test(ctx, file_path) -> None:
-    """Generate unit tests for a code file."""
-    config = ctx.obj["config"]
+    try:
+        results = await asyncio.gather(*(_run_one(prompt) for prompt in prompts))
+        await prefetch
+    finally:
+        await agent.close()
 
-    async def _test() -> None:
-        agent = AgentCoder(config=config)
-        prompt = f"Generate comprehensive unit tests for: {file_path}"
-        messages = await agent.run(prompt)
+    for messages in results:
         for message in messages:
             _print_message(message)
-        await agent.close()
-
-    asyncio.run(_test())
+    _flush_text()
 
 
 def _print_message(message: dict) -> None:
     """Print a message to stdout."""
-    if "text" in message:
-        click.echo(message["text"], nl=False)
-    elif "tool_use" in message:
-        tool_name = message["tool_use"].get("name", "unknown")
-        click.echo(f"\033[90m[using {tool_name}]\033[0m", nl=True)
-    elif "tool_result" in message:
-        result = message["tool_result"]
-        if result.get("is_error"):
-            click.echo(f"\033[91m[error]\033[0m {result.get('content', [{}])[0].get('text', '')}", nl=True)
+    # Dispatch on the first key that has a printer; normally it is the only key
+    for key in message:
+        printer = _PRINTERS.get(key)
+        if printer is not None:
+            printer(message[key])
+            return
+
+
+def _print_tool_use(tool_use: dict) -> None:
+    """Print a grey "[using <tool>]" line."""
+    tool_name = tool_use.get("name", "unknown")
+    _write_bytes(_TOOL_USE_OPEN + tool_name.encode() + _TOOL_USE_CLOSE)
+
+
+def _print_tool_result(result: dict) -> None:
+    """Print a red "[error]" line for failed tool results."""
+    if result.get("is_error"):
+        text = result.get("content", [{}])[0].get("text", "")
+        _write_bytes(_ERROR_OPEN + text.encode() + _NEWLINE)
+
+
+def _write_bytes(data: bytes) -> None:
+    """Write pre-encoded bytes straight to stdout's binary buffer."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # stdout replaced by a text-only stream (e.g. under test capture)
+        sys.stdout.write(data.decode())
+        return
+    # Drain pending text first so the two layers don't interleave out of order
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
+def _write_text(text: str) -> None:
+    """Write streamed text to stdout, coalescing flushes across small chunks."""
+    global _unflushed_writes
+    sys.stdout.write(text)
+    _unflushed_writes += 1
+    if _unflushed_writes >= _FLUSH_EVERY or time.monotonic() - _last_flush >= _FLUSH_INTERVAL:
+        _flush_text()
+    else:
+        _schedule_idle_flush()
+
+
+def _flush_text() -> None:
+    """Flush stdout and reset the coalescing state."""
+    global _unflushed_writes, _last_flush, _idle_flush
+    if _idle_flush is not None:
+        _idle_flush.cancel()
+        _idle_flush = None
+    sys.stdout.flush()
+    _unflushed_writes = 0
+    _last_flush = time.monotonic()
+
+
+def _schedule_idle_flush() -> None:
+    """Flush held-back text if no further chunk arrives within the interval."""
+    global _idle_flush
+    if _idle_flush is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to wait on; the end-of-output flush covers it
+        return
+    _idle_flush = loop.call_later(_FLUSH_INTERVAL, _flush_text)
+
+
+_PRINTERS = {
+    "text": _write_text,
+    "tool_use": _print_tool_use,
+    "tool_result": _print_tool_result,
+}
 
 
 def main() -> None:
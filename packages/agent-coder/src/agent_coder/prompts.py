@@ -5,6 +5,8 @@ This module defines specialized system prompts for different
 coding tasks and agent personalities.
 """
 
+from typing import Final, Literal, overload
+
 # Base coding assistant prompt
 CODING_ASSISTANT_PROMPT = """You are an expert software developer and AI coding assistant.
 
@@ -108,22 +110,49 @@ When creating a new project:
 Follow modern best practices and community conventions for the specific technology stack."""
 
 
-def get_prompt(prompt_type: str = "coding_assistant") -> str:
+# UTF-8 encoded prompts, computed once for callers that send raw bytes.
+# The SDK's system_prompt takes str, so nothing in agent-coder uses these yet.
+CODING_ASSISTANT_PROMPT_BYTES = CODING_ASSISTANT_PROMPT.encode("utf-8")
+CODE_REVIEWER_PROMPT_BYTES = CODE_REVIEWER_PROMPT.encode("utf-8")
+TEST_GENERATOR_PROMPT_BYTES = TEST_GENERATOR_PROMPT.encode("utf-8")
+REFACTORING_PROMPT_BYTES = REFACTORING_PROMPT.encode("utf-8")
+PROJECT_SCAFFOLDING_PROMPT_BYTES = PROJECT_SCAFFOLDING_PROMPT.encode("utf-8")
+
+
+# Prompt lookup tables, keyed by prompt type
+_PROMPTS: Final[dict[str, str]] = {
+    "coding_assistant": CODING_ASSISTANT_PROMPT,
+    "code_reviewer": CODE_REVIEWER_PROMPT,
+    "test_generator": TEST_GENERATOR_PROMPT,
+    "refactoring": REFACTORING_PROMPT,
+    "project_scaffolding": PROJECT_SCAFFOLDING_PROMPT,
+}
+
+_PROMPTS_BYTES: Final[dict[str, bytes]] = {
+    "coding_assistant": CODING_ASSISTANT_PROMPT_BYTES,
+    "code_reviewer": CODE_REVIEWER_PROMPT_BYTES,
+    "test_generator": TEST_GENERATOR_PROMPT_BYTES,
+    "refactoring": REFACTORING_PROMPT_BYTES,
+    "project_scaffolding": PROJECT_SCAFFOLDING_PROMPT_BYTES,
+}
+
+
+@overload
+def get_prompt(prompt_type: str = ..., *, as_bytes: Literal[False] = ...) -> str: ...
+@overload
+def get_prompt(prompt_type: str = ..., *, as_bytes: Literal[True]) -> bytes: ...
+def get_prompt(prompt_type: str = "coding_assistant", *, as_bytes: bool = False) -> str | bytes:
     """
     Get a system prompt by type.
 
     Args:
         prompt_type: Type of prompt ("coding_assistant", "code_reviewer",
                      "test_generator", "refactoring", "project_scaffolding")
+        as_bytes: Return the pre-encoded UTF-8 bytes instead of a string
 
     Returns:
-        The requested system prompt string
+        The requested system prompt string (or bytes if ``as_bytes`` is set)
     """
-    prompts = {
-        "coding_assistant": CODING_ASSISTANT_PROMPT,
-        "code_reviewer": CODE_REVIEWER_PROMPT,
-        "test_generator": TEST_GENERATOR_PROMPT,
-        "refactoring": REFACTORING_PROMPT,
-        "project_scaffolding": PROJECT_SCAFFOLDING_PROMPT,
-    }
-    return prompts.get(prompt_type, CODING_ASSISTANT_PROMPT)
+    if as_bytes:
+        return _PROMPTS_BYTES.get(prompt_type, CODING_ASSISTANT_PROMPT_BYTES)
+    return _PROMPTS.get(prompt_type, CODING_ASSISTANT_PROMPT)
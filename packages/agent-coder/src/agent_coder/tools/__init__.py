@@ -3,26 +3,46 @@ Custom tools for agent-coder.
 
 This module provides MCP tools for coding tasks including code analysis,
 refactoring, test generation, and code explanation.
+
+Tool functions are resolved lazily (PEP 562) so that importing this package
+does not load every tool module up front.
 """
 
-from .code_tools import (
-    analyze_code,
-    explain_code,
-    generate_tests,
-    refactor_code,
-)
-from .git_tools import git_commit, git_diff, git_status
-from .project_tools import add_dependency, create_project, list_structure
+import importlib
+
+_TOOL_MODULES = {
+    "analyze_code": ".code_tools",
+    "analyze_code_stream": ".code_tools",
+    "explain_code": ".code_tools",
+    "generate_tests": ".code_tools",
+    "refactor_code": ".code_tools",
+    "git_status": ".git_tools",
+    "git_status_batch": ".git_tools",
+    "git_commit": ".git_tools",
+    "git_diff": ".git_tools",
+    "create_project": ".project_tools",
+    "add_dependency": ".project_tools",
+    "list_structure": ".project_tools",
+}
 
 __all__ = [
     "analyze_code",
+    "analyze_code_stream",
     "explain_code",
     "generate_tests",
     "refactor_code",
     "git_status",
+    "git_status_batch",
     "git_commit",
     "git_diff",
     "create_project",
     "add_dependency",
     "list_structure",
 ]
+
+
+def __getattr__(name: str):
+    if name in _TOOL_MODULES:
+        module = importlib.import_module(_TOOL_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,61 @@
+"""
+Python AST helpers for the code tools.
+
+Kept in a separate module so that ``ast`` is only imported once a Python
+file is actually analyzed.
+"""
+
+import ast
+import functools
+
+
+@functools.lru_cache(maxsize=32)
+def safe_parse(content: str, filename: str = "<unknown>") -> tuple[ast.Module | None, str | None]:
+    """
+    Parse Python source, returning ``(tree, None)`` or ``(None, error)``.
+
+    Calls ``compile`` with ``PyCF_ONLY_AST`` directly (what ``ast.parse``
+    wraps) and ``dont_inherit=True`` so this module's ``__future__`` flags
+    never leak into the parse. Failures come back as a short
+    ``"line N: msg"`` string rather than an exception, so callers need no
+    try/except and the SyntaxError (and its traceback) is dropped here.
+    Both outcomes are cached, so re-analyzing a broken file is as cheap as
+    re-analyzing a good one.
+    """
+    try:
+        return compile(content, filename, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True), None
+    except SyntaxError as e:
+        return None, f"line {e.lineno}: {e.msg}"
+
+
+class DefCollector(ast.NodeVisitor):
+    """
+    Collect function, class and import names from a module.
+
+    Function bodies are not entered, so nested helpers and their locals are
+    skipped; class bodies are, so methods are still reported.
+    """
+
+    def __init__(self) -> None:
+        self.functions: list[str] = []
+        self.classes: list[str] = []
+        # A set: callers only need the number of distinct imports
+        self.imports: set[str] = set()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        self.functions.append(node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append(node.name)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.add(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        prefix = (node.module or "") + "."
+        for alias in node.names:
+            self.imports.add(prefix + alias.name)
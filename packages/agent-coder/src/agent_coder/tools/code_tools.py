@@ -4,52 +4,167 @@ Code analysis and manipulation tools.
 This module provides tools for analyzing, refactoring, and understanding code.
 """
 
-import ast
+import asyncio
+import functools
+import io
+import os
+import re
+from collections.abc import AsyncIterator, Iterable, Iterator
 from pathlib import Path
 
 
+# Matches the first non-whitespace character of each non-blank line
+_NON_EMPTY_LINE_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+
+# File extension to language name
+_LANG_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".jsx": "javascript",
+    ".java": "java",
+    ".go": "go",
+    ".rs": "rust",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".hpp": "cpp",
+    ".h": "c",
+    ".cs": "csharp",
+    ".php": "php",
+    ".rb": "ruby",
+    ".kt": "kotlin",
+    ".swift": "swift",
+    ".sh": "bash",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".xml": "xml",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".md": "markdown",
+}
+
+
+# refactor_code's report is the same for every file apart from the header
+_REFACTOR_TEMPLATE = (
+    "## Refactoring Suggestions: {file_path}\n"
+    "\n"
+    "### Potential Improvements:\n"
+    "\n"
+    "1. **Code Organization**\n"
+    "   - Check for repeated code patterns that could be extracted\n"
+    "   - Consider breaking long functions into smaller units\n"
+    "\n"
+    "2. **Naming**\n"
+    "   - Ensure variable and function names clearly express intent\n"
+    "   - Use consistent naming conventions\n"
+    "\n"
+    "3. **Complexity**\n"
+    "   - Look for deeply nested conditionals that could be simplified\n"
+    "   - Consider guard clauses for early returns\n"
+    "\n"
+    "4. **Documentation**\n"
+    "   - Add docstrings to functions and classes\n"
+    "   - Document non-obvious logic\n"
+)
+
+# Fixed tail of generate_tests' report for Python files
+_PYTEST_FOOTER = (
+    "\n"
+    "\n### Test Framework: pytest\n"
+    "\n```python\n"
+    "import pytest\n"
+    "\n"
+    "# TODO: Implement tests\n"
+    "```"
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_file(file_path: str, mtime_ns: int, size: int) -> str:
+    """Read a file; cached by path, modification time and size."""
+    return Path(file_path).read_text()
+
+
 def _get_file_content(file_path: str) -> str:
     """Get file content safely."""
-    path = Path(file_path)
-    if not path.exists():
+    # One cache entry per file, however the caller spelled the path
+    abs_path = os.path.abspath(file_path)
+    try:
+        stat = os.stat(abs_path)
+    except OSError:
         return f"Error: File not found: {file_path}"
-    return path.read_text()
+    return _read_file(abs_path, stat.st_mtime_ns, stat.st_size)
+
 
+async def read_files(file_paths: Iterable[str]) -> list[str | BaseException]:
+    """
+    Read several files concurrently in worker threads.
+
+    Overlaps per-file I/O latency and warms the read cache that the tools
+    use. Results are in input order; a file that cannot be decoded comes
+    back as its exception instead of aborting the batch.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(_get_file_content, path) for path in file_paths),
+        return_exceptions=True,
+    )
 
+
+@functools.lru_cache(maxsize=512)
 def _detect_language(file_path: str) -> str:
     """Detect programming language from file extension."""
-    ext = Path(file_path).suffix.lower()
-    lang_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".tsx": "typescript",
-        ".jsx": "javascript",
-        ".java": "java",
-        ".go": "go",
-        ".rs": "rust",
-        ".c": "c",
-        ".cpp": "cpp",
-        ".cc": "cpp",
-        ".hpp": "cpp",
-        ".h": "c",
-        ".cs": "csharp",
-        ".php": "php",
-        ".rb": "ruby",
-        ".kt": "kotlin",
-        ".swift": "swift",
-        ".sh": "bash",
-        ".json": "json",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".toml": "toml",
-        ".xml": "xml",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".md": "markdown",
-    }
-    return lang_map.get(ext, "text")
+    ext = os.path.splitext(file_path)[1].lower()
+    return _LANG_MAP.get(ext, "text")
+
+
+def _analyze_sections(file_path: str, content: str) -> Iterator[str]:
+    """Yield the analysis report one section at a time."""
+    language = _detect_language(file_path)
+    # Count lines without materializing a list of them
+    total_lines = content.count("\n") + (0 if content.endswith("\n") else 1)
+    non_empty_lines = len(_NON_EMPTY_LINE_RE.findall(content))
+
+    # Basic analysis
+    yield (
+        f"## Code Analysis: {file_path}\n"
+        f"**Language**: {language}\n"
+        f"**Total Lines**: {total_lines}\n"
+        f"**Code Lines**: {non_empty_lines}"
+    )
+
+    # Language-specific analysis
+    if language == "python":
+        from ._python_ast import DefCollector, safe_parse
+
+        tree, error = safe_parse(content, file_path)
+        if tree is None:
+            yield f"\n\n**Syntax Error**: {error}"
+            return
+
+        collector = DefCollector()
+        collector.visit(tree)
+        functions = collector.functions
+        classes = collector.classes
+
+        yield (
+            f"\n**Functions**: {len(functions)}"
+            f"\n**Classes**: {len(classes)}"
+            f"\n**Imports**: {len(collector.imports)}"
+        )
+
+        if functions:
+            section = "\n\n**Functions**: " + ", ".join(functions[:10])
+            if len(functions) > 10:
+                section += f"\n... and {len(functions) - 10} more"
+            yield section
+
+        if classes:
+            yield "\n\n**Classes**: " + ", ".join(classes)
 
 
 def analyze_code(args: dict) -> dict:
@@ -68,52 +183,33 @@ def analyze_code(args: dict) -> dict:
     if content.startswith("Error:"):
         return {"content": [{"type": "text", "text": content}], "is_error": True}
 
-    language = _detect_language(file_path)
-    lines = content.split("\n")
-    total_lines = len(lines)
-    non_empty_lines = sum(1 for line in lines if line.strip())
-    comment_lines = 0
+    text = "".join(_analyze_sections(file_path, content))
+    return {"content": [{"type": "text", "text": text}]}
 
-    # Basic analysis
-    analysis = [
-        f"## Code Analysis: {file_path}",
-        f"**Language**: {language}",
-        f"**Total Lines**: {total_lines}",
-        f"**Code Lines**: {non_empty_lines}",
-    ]
 
-    # Language-specific analysis
-    if language == "python":
-        try:
-            tree = ast.parse(content)
-            functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-            imports = []
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    imports.extend([alias.name for alias in node.names])
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    imports.extend([f"{module}.{alias.name}" for alias in node.names])
-
-            analysis.append(f"**Functions**: {len(functions)}")
-            analysis.append(f"**Classes**: {len(classes)}")
-            analysis.append(f"**Imports**: {len(set(imports))}")
+async def analyze_code_stream(args: dict) -> AsyncIterator[dict]:
+    """
+    Streaming variant of analyze_code.
 
-            if functions:
-                analysis.append("\n**Functions**: " + ", ".join(functions[:10]))
-                if len(functions) > 10:
-                    analysis.append(f"... and {len(functions) - 10} more")
+    Yields one text content block per report section (header, metrics,
+    function list, class list) as soon as it is ready; concatenated, they
+    equal analyze_code's text. A read error is yielded as a single block.
 
-            if classes:
-                analysis.append("\n**Classes**: " + ", ".join(classes))
+    Args:
+        args: Dictionary with 'file_path' key
 
-        except SyntaxError as e:
-            analysis.append(f"\n**Syntax Error**: {e}")
+    Yields:
+        Content blocks of the form {"type": "text", "text": ...}
+    """
+    file_path = args.get("file_path", "")
+    content = _get_file_content(file_path)
 
-    result_text = "\n".join(analysis)
-    return {"content": [{"type": "text", "text": result_text}]}
+    if content.startswith("Error:"):
+        yield {"type": "text", "text": content}
+        return
+
+    for section in _analyze_sections(file_path, content):
+        yield {"type": "text", "text": section}
 
 
 def explain_code(args: dict) -> dict:
@@ -136,50 +232,48 @@ def explain_code(args: dict) -> dict:
 
     language = _detect_language(file_path)
 
-    explanation = [
-        f"## Code Explanation: {file_path}",
-        f"**Language**: {language}",
-        "",
-        "This file contains code that should be analyzed for its functionality.",
-        "",
-        "Key elements to examine:",
-        "- Main functions and their purposes",
-        "- Data structures used",
-        "- Algorithms implemented",
-        "- Dependencies and imports",
-        "",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    w(f"## Code Explanation: {file_path}\n")
+    w(f"**Language**: {language}\n")
+    w(
+        "\n"
+        "This file contains code that should be analyzed for its functionality.\n"
+        "\n"
+        "Key elements to examine:\n"
+        "- Main functions and their purposes\n"
+        "- Data structures used\n"
+        "- Algorithms implemented\n"
+        "- Dependencies and imports\n"
+    )
 
     if focus:
-        explanation.append(f"**Focus Area**: {focus}")
+        w(f"\n**Focus Area**: {focus}")
 
     if language == "python":
-        try:
-            tree = ast.parse(content)
-            functions = []
-            classes = []
+        import ast
 
-            for node in tree.body:
-                if isinstance(node, ast.FunctionDef):
-                    docstring = ast.get_docstring(node)
-                    funcs_info = f"**{node.name}**({', '.join(arg.arg for arg in node.args.args)})"
-                    if docstring:
-                        funcs_info += f"\n   {docstring.split(chr(10))[0]}"
-                    functions.append(funcs_info)
-                elif isinstance(node, ast.ClassDef):
-                    docstring = ast.get_docstring(node)
-                    classes.append(f"**class {node.name}**")
+        from ._python_ast import safe_parse
+
+        tree, _ = safe_parse(content, file_path)
+        if tree is not None:
+            functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
+            classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
 
             if functions:
-                explanation.append("\n### Functions\n" + "\n".join(functions))
+                w("\n\n### Functions")
+                for node in functions:
+                    w(f"\n**{node.name}**({', '.join(arg.arg for arg in node.args.args)})")
+                    docstring = ast.get_docstring(node)
+                    if docstring:
+                        w(f"\n   {docstring.split(chr(10))[0]}")
 
             if classes:
-                explanation.append("\n### Classes\n" + "\n".join(classes))
-
-        except SyntaxError:
-            pass
+                w("\n\n### Classes")
+                for node in classes:
+                    w(f"\n**class {node.name}**")
 
-    return {"content": [{"type": "text", "text": "\n".join(explanation)}]}
+    return {"content": [{"type": "text", "text": buf.getvalue()}]}
 
 
 def refactor_code(args: dict) -> dict:
@@ -198,30 +292,8 @@ def refactor_code(args: dict) -> dict:
     if content.startswith("Error:"):
         return {"content": [{"type": "text", "text": content}], "is_error": True}
 
-    suggestions = [
-        f"## Refactoring Suggestions: {file_path}",
-        "",
-        "### Potential Improvements:",
-        "",
-        "1. **Code Organization**",
-        "   - Check for repeated code patterns that could be extracted",
-        "   - Consider breaking long functions into smaller units",
-        "",
-        "2. **Naming**",
-        "   - Ensure variable and function names clearly express intent",
-        "   - Use consistent naming conventions",
-        "",
-        "3. **Complexity**",
-        "   - Look for deeply nested conditionals that could be simplified",
-        "   - Consider guard clauses for early returns",
-        "",
-        "4. **Documentation**",
-        "   - Add docstrings to functions and classes",
-        "   - Document non-obvious logic",
-        "",
-    ]
-
-    return {"content": [{"type": "text", "text": "\n".join(suggestions)}]}
+    text = _REFACTOR_TEMPLATE.format(file_path=file_path)
+    return {"content": [{"type": "text", "text": text}]}
 
 
 def generate_tests(args: dict) -> dict:
@@ -242,31 +314,26 @@ def generate_tests(args: dict) -> dict:
 
     language = _detect_language(file_path)
 
-    test_suggestions = [
-        f"## Test Generation: {file_path}",
-        f"**Language**: {language}",
-        "",
-        "### Recommended Test Cases:",
-        "",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    w(f"## Test Generation: {file_path}\n")
+    w(f"**Language**: {language}\n")
+    w("\n### Recommended Test Cases:\n")
 
     if language == "python":
-        try:
-            tree = ast.parse(content)
-            functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+        from ._python_ast import DefCollector, safe_parse
 
-            for func in functions[:10]:
-                test_suggestions.append(f"- `test_{func}`: Test the {func} function")
+        tree, _ = safe_parse(content, file_path)
+        if tree is not None:
+            collector = DefCollector()
+            collector.visit(tree)
+            functions = collector.functions
 
-            test_suggestions.append("\n### Test Framework: pytest")
-            test_suggestions.append("\n```python")
-            test_suggestions.append("import pytest")
-            test_suggestions.append("")
-            test_suggestions.append("# TODO: Implement tests")
-            test_suggestions.append("```")
+            for func in functions[:10]:
+                w(f"\n- `test_{func}`: Test the {func} function")
 
-        except SyntaxError:
-            test_suggestions.append("Unable to parse file for test suggestions due to syntax errors.")
+            w(_PYTEST_FOOTER)
+        else:
+            w("\nUnable to parse file for test suggestions due to syntax errors.")
 
-    return {"content": [{"type": "text", "text": "\n".join(test_suggestions)}]}
+    return {"content": [{"type": "text", "text": buf.getvalue()}]}
@@ -5,37 +5,172 @@ This module provides tools for git operations including status,
 commit creation, and diff analysis.
 """
 
+import io
+import os
+import re
+import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def _run_git_command(args: list[str], cwd: str = ".") -> tuple[str, str, int]:
+# Absolute path of git, looked up on PATH once at import rather than per spawn
+_GIT_BIN = shutil.which("git")
+
+# Lower-cased fragment of git's "fatal: not a git repository ..." error
+_NOT_A_REPO = "not a git repository"
+
+# Seconds a single git command may run before it is abandoned
+_GIT_TIMEOUT = 10
+
+# Prefix for commands that only read: skips the opportunistic index refresh
+# (and its lock + rewrite) that 'git status' and friends otherwise perform
+_READ_ONLY_ARGS = ["--no-optional-locks"]
+
+
+# e.g. " 3 files changed, 450 insertions(+), 900 deletions(-)"
+_SHORTSTAT_RE = re.compile(
+    r"(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?"
+)
+
+
+# Porcelain XY status -> git_status section. Whole-code matches take
+# precedence over the index-column (X) table.
+_STATUS_BY_CODE = {" M": "modified", "??": "untracked"}
+_STATUS_BY_INDEX = {"R": "renamed", "M": "staged", "A": "staged", "D": "staged", "C": "staged"}
+
+
+def _run_git_command(
+    args: list[str], cwd: str = ".", *, read_only: bool = False
+) -> tuple[str, str, int]:
     """Run a git command and return stdout, stderr, and return code."""
+    if _GIT_BIN is None:
+        return "", "git not found in PATH", 1
     try:
         result = subprocess.run(
-            ["git"] + args,
+            [_GIT_BIN, *_READ_ONLY_ARGS, *args] if read_only else [_GIT_BIN, *args],
             cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=_GIT_TIMEOUT,
         )
         return result.stdout, result.stderr, result.returncode
-    except FileNotFoundError:
+    except FileNotFoundError as e:
+        if e.filename == cwd:
+            return "", f"fatal: cannot change to '{cwd}': No such file or directory", 128
         return "", "git not found in PATH", 1
     except subprocess.TimeoutExpired:
         return "", "Command timed out", 1
 
 
-def _find_git_root(path: str = ".") -> str | None:
-    """Find the git root directory."""
-    current = Path(path).absolute()
-    for _ in range(20):  # Limit depth
-        if (current / ".git").exists():
-            return str(current)
-        if current.parent == current:
-            break
-        current = current.parent
-    return None
+# Absolute input path -> (toplevel, cdup), oldest first; successful lookups only
+_REPO_CACHE: dict[str, tuple[str, str]] = {}
+_REPO_CACHE_SIZE = 128
+# git_status_batch resolves paths from worker threads
+_REPO_CACHE_LOCK = threading.Lock()
+
+
+def _resolve_repo(path: str = ".") -> tuple[str, str] | None:
+    """
+    Resolve the repository containing ``path``.
+
+    Returns ``(toplevel, cdup)`` -- the git root and the relative path from
+    ``path`` up to it -- or None outside a repository. Hits are cached by
+    absolute input path (not per repository), so nested submodules and
+    worktrees each resolve to their own root. Misses are not cached, so a
+    repository created later (e.g. by ``git init``) is found on the next call.
+    Call ``_clear_repo_cache()`` after removing a repository.
+    """
+    abs_path = str(Path(path).absolute())
+    with _REPO_CACHE_LOCK:
+        cached = _REPO_CACHE.get(abs_path)
+    if cached is not None:
+        return cached
+
+    stdout, _, code = _run_git_command(
+        ["rev-parse", "--show-toplevel", "--show-cdup"], cwd=abs_path, read_only=True
+    )
+    if code != 0:
+        return None
+    toplevel, _, cdup = stdout.partition("\n")
+    repo = toplevel, cdup.strip()
+
+    with _REPO_CACHE_LOCK:
+        if len(_REPO_CACHE) >= _REPO_CACHE_SIZE:
+            del _REPO_CACHE[next(iter(_REPO_CACHE))]
+        _REPO_CACHE[abs_path] = repo
+    return repo
+
+
+def _clear_repo_cache() -> None:
+    """Forget every cached repository lookup."""
+    with _REPO_CACHE_LOCK:
+        _REPO_CACHE.clear()
+
+
+def _parse_shortstat(output: str) -> tuple[int, int, int]:
+    """Parse 'git diff --shortstat' into (files, insertions, deletions)."""
+    match = _SHORTSTAT_RE.search(output)
+    if match is None:
+        return 0, 0, 0
+    return tuple(int(n) if n else 0 for n in match.groups())
+
+
+def _nth_newline(text: str, n: int) -> int:
+    """Offset of the n-th newline in text, or len(text) if there are fewer."""
+    offset = -1
+    for _ in range(n):
+        offset = text.find("\n", offset + 1)
+        if offset == -1:
+            return len(text)
+    return offset
+
+
+def _stream_git_head(args: list[str], cwd: str, max_lines: int) -> tuple[str, int]:
+    """
+    Stream a read-only git command, keeping only its first ``max_lines`` lines.
+
+    Returns those lines as one string (without the newline that ends the
+    last kept line) and the number of lines splitting the full output on
+    newlines would give. Output past the limit is counted in chunks and
+    discarded, so memory stays proportional to what is displayed. Like
+    _run_git_command, git is killed after _GIT_TIMEOUT seconds; the output
+    read up to then is returned.
+    """
+    if _GIT_BIN is None:
+        return "", 0
+    try:
+        proc = subprocess.Popen(
+            [_GIT_BIN, *_READ_ONLY_ARGS, *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return "", 0
+
+    chunks = []
+    newlines = 0
+    # Killing git closes the pipe, which ends the reads below
+    watchdog = threading.Timer(_GIT_TIMEOUT, proc.kill)
+    watchdog.start()
+    try:
+        with proc:
+            while newlines < max_lines and (chunk := proc.stdout.read(1 << 16)):
+                chunks.append(chunk)
+                newlines += chunk.count("\n")
+            while chunk := proc.stdout.read(1 << 16):
+                newlines += chunk.count("\n")
+    finally:
+        watchdog.cancel()
+
+    head = "".join(chunks)
+    if newlines >= max_lines:
+        # One slice at the max_lines-th newline instead of split + rejoin
+        head = head[:_nth_newline(head, max_lines)]
+    return head, newlines + 1
 
 
 def git_status(args: dict) -> dict:
@@ -49,67 +184,107 @@ def git_status(args: dict) -> dict:
         Git status information
     """
     path = args.get("path", ".")
-    git_root = _find_git_root(path)
+    repo = _resolve_repo(path)
 
-    if not git_root:
+    if repo is None:
         return {
             "content": [{"type": "text", "text": "Not a git repository (or any parent up to mount point)"}],
             "is_error": True,
         }
+    git_root = repo[0]
 
-    stdout, stderr, code = _run_git_command(["status", "--porcelain"], cwd=path)
+    # -z: NUL-terminated entries, paths never quoted or escaped
+    stdout, stderr, code = _run_git_command(
+        ["status", "--porcelain", "-z"], cwd=path, read_only=True
+    )
 
     if code != 0:
         return {"content": [{"type": "text", "text": f"Error: {stderr}"}], "is_error": True}
 
-    if not stdout.strip():
+    if not stdout:
         return {"content": [{"type": "text", "text": "Working tree clean. No changes."}]}
 
     # Parse status output
-    lines = stdout.strip().split("\n")
-    staged = []
-    modified = []
-    untracked = []
-    renamed = []
-
-    for line in lines:
-        if not line:
+    buckets = {"staged": [], "modified": [], "untracked": [], "renamed": []}
+    entries = iter(stdout.split("\0"))
+    for entry in entries:
+        if len(entry) < 3:
             continue
-        status, filepath = line[:2], line[3:]
-        if status[0] == "R":
-            renamed.append(filepath)
-        elif status[0] in "MADRC":
-            staged.append(filepath)
-        elif status[0] == " " and status[1] in "M":
-            modified.append(filepath)
-        elif status == "??":
-            untracked.append(filepath)
-
-    result = [f"## Git Status: {Path(path).absolute()}", ""]
+        status = entry[:2]
+        bucket = _STATUS_BY_CODE.get(status) or _STATUS_BY_INDEX.get(status[0])
+        if bucket is not None:
+            buckets[bucket].append(entry[3:])
+        if status[0] in "RC":
+            # Renames and copies are followed by a separate source-path entry
+            next(entries, None)
+    staged = buckets["staged"]
+    modified = buckets["modified"]
+    untracked = buckets["untracked"]
+
+    buf = io.StringIO()
+    w = buf.write
+    w(f"## Git Status: {Path(path).absolute()}\n\n")
 
     if staged:
-        result.append("### Staged changes:")
+        w("### Staged changes:\n")
         for f in staged:
-            result.append(f"  - {f}")
-        result.append("")
+            w(f"  - {f}\n")
+        w("\n")
 
     if modified:
-        result.append("### Modified but not staged:")
+        w("### Modified but not staged:\n")
         for f in modified:
-            result.append(f"  - {f}")
-        result.append("")
+            w(f"  - {f}\n")
+        w("\n")
 
     if untracked:
-        result.append("### Untracked files:")
+        w("### Untracked files:\n")
         for f in untracked[:20]:
-            result.append(f"  - {f}")
+            w(f"  - {f}\n")
         if len(untracked) > 20:
-            result.append(f"  ... and {len(untracked) - 20} more")
-        result.append("")
+            w(f"  ... and {len(untracked) - 20} more\n")
+        w("\n")
+
+    w(f"**Git root**: {git_root}")
+
+    return {"content": [{"type": "text", "text": buf.getvalue()}]}
 
-    result.append(f"**Git root**: {git_root}")
 
-    return {"content": [{"type": "text", "text": "\n".join(result)}]}
+def git_status_batch(args: dict) -> dict:
+    """
+    Get git status for several paths at once.
+
+    Each path is handled by git_status on a worker thread; git runs as a
+    subprocess with an explicit ``cwd``, so the threads never share state
+    and mostly wait with the GIL released.
+
+    Args:
+        args: Dictionary with 'paths' key (list of paths)
+
+    Returns:
+        Git status information for every path, in input order
+    """
+    paths = args.get("paths") or []
+
+    if not paths:
+        return {"content": [{"type": "text", "text": "Error: paths is required"}], "is_error": True}
+
+    max_workers = min(len(paths), max(1, (os.cpu_count() or 1) * 3 // 4))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda p: git_status({"path": p}), paths))
+
+    sections = []
+    for path, result in zip(paths, results):
+        text = result["content"][0]["text"]
+        if not text.startswith("## "):
+            # Errors and the clean-tree message carry no header of their own
+            text = f"## Git Status: {path}\n\n{text}"
+        sections.append(text)
+
+    response = {"content": [{"type": "text", "text": "\n\n---\n\n".join(sections)}]}
+    if all(result.get("is_error") for result in results):
+        response["is_error"] = True
+    return response
 
 
 def git_commit(args: dict) -> dict:
@@ -129,27 +304,22 @@ def git_commit(args: dict) -> dict:
     if not message:
         return {"content": [{"type": "text", "text": "Error: commit message is required"}], "is_error": True}
 
-    if not _find_git_root(path):
-        return {"content": [{"type": "text", "text": "Not a git repository"}], "is_error": True}
-
+    # No repository pre-check: git reports that itself, and is translated below
     if add_all:
-        _run_git_command(["add", "."], cwd=path)
+        _, stderr, code = _run_git_command(["add", "."], cwd=path)
+        if code != 0 and _NOT_A_REPO in stderr.lower():
+            return {"content": [{"type": "text", "text": "Not a git repository"}], "is_error": True}
 
     stdout, stderr, code = _run_git_command(["commit", "-m", message], cwd=path)
 
     if code != 0:
+        if _NOT_A_REPO in stderr.lower():
+            return {"content": [{"type": "text", "text": "Not a git repository"}], "is_error": True}
         return {"content": [{"type": "text", "text": f"Commit failed: {stderr}"}], "is_error": True}
 
-    result = [
-        "## Commit Created",
-        "",
-        f"**Message**: {message}",
-        "",
-        "### Output:",
-        stdout,
-    ]
+    text = f"## Commit Created\n\n**Message**: {message}\n\n### Output:\n{stdout}"
 
-    return {"content": [{"type": "text", "text": "\n".join(result)}]}
+    return {"content": [{"type": "text", "text": text}]}
 
 
 def git_diff(args: dict) -> dict:
@@ -166,16 +336,17 @@ def git_diff(args: dict) -> dict:
     staged = args.get("staged", False)
     file_path = args.get("file", "")
 
-    if not _find_git_root(path):
+    if _resolve_repo(path) is None:
         return {"content": [{"type": "text", "text": "Not a git repository"}], "is_error": True}
 
     cmd = ["diff"]
     if staged:
         cmd.append("--staged")
-    if file_path:
-        cmd.append(file_path)
 
-    stdout, stderr, code = _run_git_command(cmd, cwd=path)
+    # git computes the counts; the textual diff is only streamed for display
+    stdout, stderr, code = _run_git_command(
+        [*cmd, "--shortstat", *([file_path] if file_path else [])], cwd=path, read_only=True
+    )
 
     if code != 0 and stderr:
         return {"content": [{"type": "text", "text": f"Error: {stderr}"}], "is_error": True}
@@ -183,31 +354,32 @@ def git_diff(args: dict) -> dict:
     if not stdout.strip():
         return {"content": [{"type": "text", "text": "No differences found"}]}
 
-    # Analyze diff
-    lines = stdout.split("\n")
-    added_lines = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
-    removed_lines = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
-    files_changed = sum(1 for line in lines if line.startswith("diff --git"))
-
-    result = [
-        f"## Git Diff Summary",
-        f"**Staged**: {staged}",
-        f"**Files Changed**: {files_changed}",
-        f"**Lines Added**: {added_lines}",
-        f"**Lines Removed**: {removed_lines}",
-        "",
-        "### Diff:",
-        "```diff",
-    ]
+    files_changed, added_lines, removed_lines = _parse_shortstat(stdout)
 
-    # Truncate very long diffs
+    if file_path:
+        cmd.append(file_path)
     max_lines = 500
-    if len(lines) > max_lines:
-        result.extend(lines[:max_lines])
-        result.append(f"... ({len(lines) - max_lines} more lines)")
-    else:
-        result.extend(lines)
+    head, total_lines = _stream_git_head(cmd, path, max_lines)
+
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "## Git Diff Summary\n"
+        f"**Staged**: {staged}\n"
+        f"**Files Changed**: {files_changed}\n"
+        f"**Lines Added**: {added_lines}\n"
+        f"**Lines Removed**: {removed_lines}\n"
+        "\n"
+        "### Diff:\n"
+        "```diff\n"
+    )
+
+    # Truncate very long diffs
+    w(head)
+    w("\n")
+    if total_lines > max_lines:
+        w(f"... ({total_lines - max_lines} more lines)\n")
 
-    result.append("```")
+    w("```")
 
-    return {"content": [{"type": "text", "text": "\n".join(result)}]}
+    return {"content": [{"type": "text", "text": buf.getvalue()}]}
@@ -6,71 +6,45 @@ managing dependencies, and listing project structure.
 """
 
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, NamedTuple
 
+try:
+    import scandir_rs  # optional: native directory walker for list_structure
+except ImportError:
+    scandir_rs = None
 
-def create_project(args: dict) -> dict:
-    """
-    Create a new project structure.
-
-    Args:
-        args: Dictionary with 'project_name', 'project_type', and optional 'path' keys
-
-    Returns:
-        Result message
-    """
-    project_name = args.get("project_name", "")
-    project_type = args.get("project_type", "python")
-    base_path = args.get("path", ".")
-
-    if not project_name:
-        return {"content": [{"type": "text", "text": "Error: project_name is required"}], "is_error": True}
-
-    project_path = Path(base_path) / project_name
-
-    if project_path.exists():
-        return {
-            "content": [{"type": "text", "text": f"Error: Directory {project_name} already exists"}],
-            "is_error": True,
-        }
 
-    # Create project structure based on type
-    os.makedirs(project_path, exist_ok=True)
+# Directories left out of list_structure output
+_TREE_IGNORE = frozenset({".git", "node_modules", "__pycache__", ".venv", "venv", "target", "dist", "build"})
 
-    if project_type == "python":
-        _create_python_project(project_path, project_name)
-    elif project_type == "node":
-        _create_node_project(project_path, project_name)
-    elif project_type == "rust":
-        _create_rust_project(project_path, project_name)
-    else:
-        _create_generic_project(project_path, project_name)
-
-    result = [
-        f"## Project Created: {project_name}",
-        f"**Type**: {project_type}",
-        f"**Path**: {project_path.absolute()}",
-        "",
-        "### Next Steps:",
-        "1. cd " + project_name,
-        "2. Review the generated structure",
-        "3. Start coding!",
-    ]
 
-    return {"content": [{"type": "text", "text": "\n".join(result)}]}
+# list_structure output cache: (root, root mtime_ns, max_depth) -> (text, built at)
+_TREE_CACHE_SIZE = 16
+_TREE_CACHE_TTL = 30.0
+_TREE_CACHE: "OrderedDict[tuple[str, int, int], tuple[str, float]]" = OrderedDict()
 
+# Marker file -> project type, in detection priority order
+_PROJECT_MARKERS = (
+    ("pyproject.toml", "python"),
+    ("setup.py", "python"),
+    ("package.json", "node"),
+    ("Cargo.toml", "rust"),
+    ("go.mod", "go"),
+)
 
-def _create_python_project(path: Path, name: str) -> None:
-    """Create a Python project structure."""
-    dirs = ["src", "tests", "docs"]
-    for d in dirs:
-        (path / d).mkdir(exist_ok=True)
+# add_dependency's per-directory project type cache: cwd -> (type, detected at)
+_PROJECT_TYPE_TTL = 30.0
+_PROJECT_TYPE_CACHE: dict[str, tuple[str | None, float]] = {}
 
-    (path / "src" / "__init__.py").touch()
-    (path / "tests" / "__init__.py").touch()
+# Scaffolding file contents. *_TMPL constants are filled with
+# .format(name=...); the rest are written verbatim.
 
-    (path / "pyproject.toml").write_text(
-        f"""[build-system]
+# Python
+_PY_PYPROJECT_TMPL = """[build-system]
 requires = ["hatchling"]
 build-backend = "hatchling.build"
 
@@ -83,10 +57,7 @@ requires-python = ">=3.10"
 [tool.black]
 line-length = 100
 """
-    )
-
-    (path / ".gitignore").write_text(
-        """__pycache__/
+_PY_GITIGNORE = """__pycache__/
 *.py[cod]
 *$py.class
 .venv/
@@ -100,10 +71,7 @@ build/
 htmlcov/
 .mypy_cache/
 """
-    )
-
-    (path / "README.md").write_text(
-        f"""# {name}
+_PY_README_TMPL = """# {name}
 
 A new Python project.
 
@@ -117,17 +85,9 @@ pip install -e .
 
 TODO: Add usage instructions
 """
-    )
-
-
-def _create_node_project(path: Path, name: str) -> None:
-    """Create a Node.js project structure."""
-    dirs = ["src", "tests"]
-    for d in dirs:
-        (path / d).mkdir(exist_ok=True)
 
-    (path / "package.json").write_text(
-        f"""{{
+# Node.js
+_NODE_PACKAGE_JSON_TMPL = """{{
   "name": "{name}",
   "version": "0.1.0",
   "description": "A new Node.js project",
@@ -141,19 +101,13 @@ def _create_node_project(path: Path, name: str) -> None:
   "license": "MIT"
 }}
 """
-    )
-
-    (path / ".gitignore").write_text(
-        """node_modules/
+_NODE_GITIGNORE = """node_modules/
 dist/
 .env
 *.log
 .DS_Store
 """
-    )
-
-    (path / "README.md").write_text(
-        f"""# {name}
+_NODE_README_TMPL = """# {name}
 
 A new Node.js project.
 
@@ -169,41 +123,24 @@ npm install
 npm start
 ```
 """
-    )
 
-
-def _create_rust_project(path: Path, name: str) -> None:
-    """Create a Rust project structure."""
-    dirs = ["src"]
-    for d in dirs:
-        (path / d).mkdir(exist_ok=True)
-
-    (path / "Cargo.toml").write_text(
-        f"""[package]
+# Rust
+_RUST_CARGO_TOML_TMPL = """[package]
 name = "{name}"
 version = "0.1.0"
 edition = "2021"
 
 [dependencies]
 """
-    )
-
-    (path / "src" / "main.rs").write_text(
-        """fn main() {
+_RUST_MAIN_RS = """fn main() {
     println!("Hello, world!");
 }
 """
-    )
-
-    (path / ".gitignore").write_text(
-        """/target
+_RUST_GITIGNORE = """/target
 **/*.rs.bk
 Cargo.lock
 """
-    )
-
-    (path / "README.md").write_text(
-        f"""# {name}
+_RUST_README_TMPL = """# {name}
 
 A new Rust project.
 
@@ -219,14 +156,133 @@ cargo build
 cargo run
 ```
 """
+
+# Generic
+_GENERIC_GITIGNORE = "*.log\n.env/\n"
+_GENERIC_README_TMPL = "# {name}\n\nTODO: Add project description\n"
+
+
+def create_project(args: dict) -> dict:
+    """
+    Create a new project structure.
+
+    Args:
+        args: Dictionary with 'project_name', 'project_type', and optional 'path' keys
+
+    Returns:
+        Result message
+    """
+    project_name = args.get("project_name", "")
+    project_type = args.get("project_type", "python")
+    base_path = args.get("path", ".")
+
+    if not project_name:
+        return {"content": [{"type": "text", "text": "Error: project_name is required"}], "is_error": True}
+
+    project_path = Path(base_path) / project_name
+
+    if project_path.exists():
+        return {
+            "content": [{"type": "text", "text": f"Error: Directory {project_name} already exists"}],
+            "is_error": True,
+        }
+
+    # Create project structure based on type
+    os.makedirs(project_path, exist_ok=True)
+
+    if project_type == "python":
+        _create_python_project(project_path, project_name)
+    elif project_type == "node":
+        _create_node_project(project_path, project_name)
+    elif project_type == "rust":
+        _create_rust_project(project_path, project_name)
+    else:
+        _create_generic_project(project_path, project_name)
+
+    text = (
+        f"## Project Created: {project_name}\n"
+        f"**Type**: {project_type}\n"
+        f"**Path**: {project_path.absolute()}\n"
+        "\n"
+        "### Next Steps:\n"
+        f"1. cd {project_name}\n"
+        "2. Review the generated structure\n"
+        "3. Start coding!"
+    )
+
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def _create_python_project(path: Path, name: str) -> None:
+    """Create a Python project structure."""
+    _write_project_files(
+        path,
+        dirs=["src", "tests", "docs"],
+        files={
+            "src/__init__.py": "",
+            "tests/__init__.py": "",
+            "pyproject.toml": _PY_PYPROJECT_TMPL.format(name=name),
+            ".gitignore": _PY_GITIGNORE,
+            "README.md": _PY_README_TMPL.format(name=name),
+        },
+    )
+
+
+def _create_node_project(path: Path, name: str) -> None:
+    """Create a Node.js project structure."""
+    _write_project_files(
+        path,
+        dirs=["src", "tests"],
+        files={
+            "package.json": _NODE_PACKAGE_JSON_TMPL.format(name=name),
+            ".gitignore": _NODE_GITIGNORE,
+            "README.md": _NODE_README_TMPL.format(name=name),
+        },
+    )
+
+
+def _create_rust_project(path: Path, name: str) -> None:
+    """Create a Rust project structure."""
+    _write_project_files(
+        path,
+        dirs=["src"],
+        files={
+            "Cargo.toml": _RUST_CARGO_TOML_TMPL.format(name=name),
+            "src/main.rs": _RUST_MAIN_RS,
+            ".gitignore": _RUST_GITIGNORE,
+            "README.md": _RUST_README_TMPL.format(name=name),
+        },
     )
 
 
 def _create_generic_project(path: Path, name: str) -> None:
     """Create a generic project structure."""
-    (path / "src").mkdir(exist_ok=True)
-    (path / ".gitignore").write_text("*.log\n.env/\n")
-    (path / "README.md").write_text(f"# {name}\n\nTODO: Add project description\n")
+    _write_project_files(
+        path,
+        dirs=["src"],
+        files={
+            ".gitignore": _GENERIC_GITIGNORE,
+            "README.md": _GENERIC_README_TMPL.format(name=name),
+        },
+    )
+
+
+def _write_project_files(path: Path, dirs: list[str], files: dict[str, str]) -> None:
+    """
+    Create a project's directories, then write its files concurrently.
+
+    Only leaf directories are passed to os.makedirs, which creates the
+    intermediate ones; file contents are written as UTF-8 bytes.
+    """
+    for d in dirs:
+        if not any(other.startswith(d + "/") for other in dirs):
+            os.makedirs(path / d, exist_ok=True)
+
+    def _write(item: tuple[str, str]) -> None:
+        (path / item[0]).write_bytes(item[1].encode())
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write, files.items()))
 
 
 def add_dependency(args: dict) -> dict:
@@ -246,30 +302,54 @@ def add_dependency(args: dict) -> dict:
         return {"content": [{"type": "text", "text": "Error: package name is required"}], "is_error": True}
 
     # Check project type and suggest install command
-    cwd = Path.cwd()
+    project_type = _detect_project_type(os.getcwd())
 
-    if (cwd / "pyproject.toml").exists() or (cwd / "setup.py").exists():
+    if project_type == "python":
         cmd = f"pip install {'--dev ' if dev else ''}{package}"
-    elif (cwd / "package.json").exists():
+    elif project_type == "node":
         cmd = f"npm install {'--save-dev ' if dev else '--save '}{package}"
-    elif (cwd / "Cargo.toml").exists():
+    elif project_type == "rust":
         cmd = f"cargo add {'--dev ' if dev else ''}{package}"
-    elif (cwd / "go.mod").exists():
+    elif project_type == "go":
         cmd = f"go get {package}"
     else:
         cmd = f"# Unknown project type. Please install {package} manually"
 
-    result = [
-        f"## Add Dependency: {package}",
-        f"**Dev Dependency**: {dev}",
-        "",
-        "### Suggested Command:",
-        f"```bash",
-        cmd,
-        "```",
-    ]
+    text = (
+        f"## Add Dependency: {package}\n"
+        f"**Dev Dependency**: {dev}\n"
+        "\n"
+        "### Suggested Command:\n"
+        "```bash\n"
+        f"{cmd}\n"
+        "```"
+    )
+
+    return {"content": [{"type": "text", "text": text}]}
 
-    return {"content": [{"type": "text", "text": "\n".join(result)}]}
+
+def _detect_project_type(cwd: str) -> str | None:
+    """
+    Detect the project type of a directory from its marker files.
+
+    The directory is listed once and the result cached for
+    _PROJECT_TYPE_TTL seconds, so a marker file created in the meantime
+    is picked up only after the entry expires.
+    """
+    now = time.monotonic()
+    cached = _PROJECT_TYPE_CACHE.get(cwd)
+    if cached is not None and now - cached[1] < _PROJECT_TYPE_TTL:
+        return cached[0]
+
+    try:
+        with os.scandir(cwd) as it:
+            names = {entry.name for entry in it}
+    except OSError:
+        names = set()
+
+    project_type = next((ptype for marker, ptype in _PROJECT_MARKERS if marker in names), None)
+    _PROJECT_TYPE_CACHE[cwd] = (project_type, now)
+    return project_type
 
 
 def list_structure(args: dict) -> dict:
@@ -286,49 +366,161 @@ def list_structure(args: dict) -> dict:
     max_depth = args.get("max_depth", 5)
 
     root_path = Path(path).absolute()
-    if not root_path.exists():
+    try:
+        root_stat = root_path.stat()
+    except OSError:
         return {"content": [{"type": "text", "text": f"Error: Path not found: {path}"}], "is_error": True}
 
+    # Only the root's mtime is part of the key, so changes deeper in the
+    # tree can go unseen until the entry's TTL runs out
+    cache_key = (str(root_path), root_stat.st_mtime_ns, max_depth)
+    now = time.monotonic()
+    cached = _TREE_CACHE.get(cache_key)
+    if cached is not None and now - cached[1] < _TREE_CACHE_TTL:
+        _TREE_CACHE.move_to_end(cache_key)
+        return {"content": [{"type": "text", "text": cached[0]}]}
+
     lines = [f"## Project Structure: {root_path.name}", ""]
-    lines.extend(_generate_tree(root_path, root_path, max_depth=max_depth))
+    # The walk itself works on plain strings and DirEntry objects
+    root = str(root_path)
+    if scandir_rs is not None and max_depth >= 0:
+        # Native parallel walker, when installed; same output as below
+        scan = _scandir_rs_scanner(root, max_depth)
+        lines.extend(_generate_tree(root, root, max_depth=max_depth, scan=scan))
+    elif max_depth < 1:
+        # Nothing below the top level is shown, so there is nothing to fan out
+        lines.extend(_generate_tree(root, root, max_depth=max_depth))
+    else:
+        # Top-level subdirectories are walked concurrently, one task each
+        with ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) * 3 // 4)) as executor:
+            lines.extend(_generate_tree(root, root, max_depth=max_depth, executor=executor))
+
+    text = "\n".join(lines)
+    _TREE_CACHE[cache_key] = (text, now)
+    _TREE_CACHE.move_to_end(cache_key)
+    if len(_TREE_CACHE) > _TREE_CACHE_SIZE:
+        _TREE_CACHE.popitem(last=False)
 
-    return {"content": [{"type": "text", "text": "\n".join(lines)}]}
+    return {"content": [{"type": "text", "text": text}]}
 
 
 def _generate_tree(
-    root: Path,
-    current: Path,
+    root: str,
+    current: str,
     prefix: str = "",
     max_depth: int = 5,
     current_depth: int = 0,
+    executor: Executor | None = None,
+    scan: Callable[[str], list[tuple[Any, bool]]] | None = None,
 ) -> list[str]:
-    """Generate tree structure lines."""
-    if current_depth > max_depth:
-        return []
+    """
+    Generate tree structure lines.
 
-    try:
-        entries = sorted(current.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-        # Skip common ignore directories
-        entries = [e for e in entries if e.name not in {".git", "node_modules", "__pycache__", ".venv", "venv", "target", "dist", "build"}]
-    except PermissionError:
+    Walks depth-first with an explicit stack rather than recursion. If
+    ``executor`` is given, the subtrees of this directory's children are
+    generated on it (serially below that) and stitched back in order.
+    ``scan`` lists one directory as (entry, is_dir) pairs, entries having
+    ``name`` and ``path``; it defaults to _scan_tree_dir.
+    """
+    if scan is None:
+        scan = _scan_tree_dir
+    if current_depth > max_depth:
         return []
 
     lines = []
-    for i, entry in enumerate(entries):
-        is_last = i == len(entries) - 1
+    # (entry, is_dir, prefix, is_last, depth), popped in display order
+    stack = _tree_stack_items(scan(current), prefix, current_depth)
+    while stack:
+        entry, is_dir, entry_prefix, is_last, depth = stack.pop()
         connector = "└── " if is_last else "├── "
-        lines.append(f"{prefix}{connector}{entry.name}")
-
-        if entry.is_dir():
-            extension = "    " if is_last else "│   "
-            lines.extend(
-                _generate_tree(
-                    root,
-                    entry,
-                    prefix=prefix + extension,
-                    max_depth=max_depth,
-                    current_depth=current_depth + 1,
+        lines.append(f"{entry_prefix}{connector}{entry.name}")
+
+        # Directories at max_depth are listed by name only, never scanned
+        if depth >= max_depth or not is_dir:
+            continue
+        child_prefix = entry_prefix + ("    " if is_last else "│   ")
+        if executor is not None and depth == current_depth:
+            # Placeholder, replaced by the subtree once every task is queued
+            lines.append(
+                executor.submit(
+                    _generate_tree, root, entry.path, child_prefix, max_depth, depth + 1, None, scan
                 )
             )
+        else:
+            stack.extend(_tree_stack_items(scan(entry.path), child_prefix, depth + 1))
+
+    if executor is not None:
+        lines = [
+            line
+            for item in lines
+            for line in (item.result() if not isinstance(item, str) else (item,))
+        ]
 
     return lines
+
+
+def _scan_tree_dir(path: str) -> list[tuple[os.DirEntry, bool]]:
+    """
+    List a directory for the tree as (entry, is_dir) pairs.
+
+    Ignored names are dropped and directories sort first. is_dir is asked
+    once per entry: it comes from the directory read's d_type where the
+    filesystem provides one, and costs at most one stat() otherwise.
+    """
+    try:
+        with os.scandir(path) as it:
+            tagged = [(e, e.is_dir(follow_symlinks=False)) for e in it if e.name not in _TREE_IGNORE]
+    except OSError:
+        return []
+    tagged.sort(key=lambda t: (not t[1], t[0].name))
+    return tagged
+
+
+class _TreeEntry(NamedTuple):
+    """The DirEntry attributes _generate_tree uses, for listings built elsewhere."""
+
+    name: str
+    path: str
+
+
+def _scandir_rs_scanner(
+    root: str, max_depth: int
+) -> Callable[[str], list[tuple[_TreeEntry, bool]]]:
+    """
+    Walk ``root`` with scandir_rs and return a scan function over the result.
+
+    The whole tree down to max_depth is read in one call on scandir_rs's
+    own threads; the returned function then answers _generate_tree from
+    memory. Symlinks and special files are kept as non-directories and
+    ignored names are filtered here, so the output matches _scan_tree_dir.
+    """
+    # scandir_rs counts levels from 1 (root listing only) and treats 0 as unlimited
+    walk = scandir_rs.Walk(
+        root,
+        max_depth=max_depth + 1,
+        dir_exclude=sorted(_TREE_IGNORE),
+        return_type=scandir_rs.ReturnType.Ext,
+    )
+    listings = {}
+    for rel, dirs, files, symlinks, other, _errors in walk:
+        base = os.path.join(root, rel) if rel else root
+        tagged = [(name, True) for name in dirs if name not in _TREE_IGNORE]
+        tagged += [
+            (name, False)
+            for group in (files, symlinks, other)
+            for name in group
+            if name not in _TREE_IGNORE
+        ]
+        tagged.sort(key=lambda t: (not t[1], t[0]))
+        listings[base] = [
+            (_TreeEntry(name, os.path.join(base, name)), is_dir) for name, is_dir in tagged
+        ]
+
+    # Empty or unreadable directories have no listing
+    return lambda path: listings.get(path, [])
+
+
+def _tree_stack_items(tagged: list[tuple[os.DirEntry, bool]], prefix: str, depth: int) -> list[tuple]:
+    """Stack items for one directory's entries, reversed so the first pops first."""
+    last = len(tagged) - 1
+    return [(*tagged[i], prefix, i == last, depth) for i in range(last, -1, -1)]
@@ -2,6 +2,8 @@
 Tests for custom tools.
 """
 
+import asyncio
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -9,14 +11,22 @@ import pytest
 
 from agent_coder.tools import (
     analyze_code,
+    analyze_code_stream,
     explain_code,
     refactor_code,
     generate_tests,
     create_project,
     list_structure,
+    git_status,
+    git_status_batch,
 )
 
 
+def _git(cwd, *args):
+    """Run a git command in a test repository."""
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
 def test_analyze_code_python():
     """Test code analysis for Python files."""
     with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
@@ -40,6 +50,71 @@ class Greeter:
         Path(f.name).unlink()
 
 
+def test_analyze_code_sees_file_changes():
+    """Test that cached reads are invalidated when the file changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "module.py")
+        path.write_text("def first(): pass\n")
+
+        result = analyze_code({"file_path": str(path)})
+        assert "first" in result["content"][0]["text"]
+
+        path.write_text("def first(): pass\n\ndef second(): pass\n")
+
+        result = analyze_code({"file_path": str(path)})
+        assert "second" in result["content"][0]["text"]
+
+
+def test_analyze_code_treats_async_functions_like_functions():
+    """Test that async functions are listed and their bodies skipped like plain ones."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "module.py")
+        path.write_text(
+            "def outer():\n"
+            "    def sync_helper(): pass\n"
+            "\n"
+            "async def fetch():\n"
+            "    def async_helper(): pass\n"
+        )
+
+        result = analyze_code({"file_path": str(path)})
+        content = result["content"][0]["text"]
+        assert "**Functions**: 2" in content
+        assert "outer, fetch" in content
+        assert "sync_helper" not in content
+        assert "async_helper" not in content
+
+
+def test_read_files_warms_cache_for_any_path_spelling():
+    """Test that prefetched files are cache hits when a tool spells the path differently."""
+    from agent_coder.tools.code_tools import _read_file, read_files
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "module.py")
+        path.write_text("def first(): pass\n")
+        asyncio.run(read_files([f"{tmpdir}/./module.py"]))
+
+        hits = _read_file.cache_info().hits
+        result = analyze_code({"file_path": str(path)})
+        assert "first" in result["content"][0]["text"]
+        assert _read_file.cache_info().hits == hits + 1
+
+
+def test_analyze_code_stream_matches_batch():
+    """Test that the streamed sections add up to the batch result."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "module.py")
+        path.write_text("import os\n\ndef first(): pass\n\nclass Second:\n    pass\n")
+
+        async def collect():
+            return [block async for block in analyze_code_stream({"file_path": str(path)})]
+
+        blocks = asyncio.run(collect())
+        assert len(blocks) > 1
+        streamed = "".join(block["text"] for block in blocks)
+        assert streamed == analyze_code({"file_path": str(path)})["content"][0]["text"]
+
+
 def test_analyze_code_nonexistent():
     """Test code analysis with non-existent file."""
     result = analyze_code({"file_path": "/nonexistent/file.py"})
@@ -125,3 +200,85 @@ def test_list_structure():
         assert "content" in result
         content = result["content"][0]["text"]
         assert "test.py" in content or "test" in content
+
+
+def test_git_status_sees_repository_created_later():
+    """Test that a failed repository lookup is not remembered."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = git_status({"path": tmpdir})
+        assert result.get("is_error", False)
+
+        _git(tmpdir, "init", "-q")
+
+        result = git_status({"path": tmpdir})
+        assert not result.get("is_error", False)
+
+
+def _status_sections(text):
+    """Split git_status output into {section heading: [paths]}."""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("### "):
+            current = sections.setdefault(line[4:].rstrip(":"), [])
+        elif line.startswith("  - ") and current is not None:
+            current.append(line[4:])
+    return sections
+
+
+def test_git_status_parses_porcelain_entries():
+    """Test that NUL-separated status entries land in the right sections."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo = Path(tmpdir)
+        _git(repo, "init", "-q")
+        (repo / "old name.txt").write_text("a\n")
+        (repo / "tracked file.txt").write_text("b\n")
+        _git(repo, "add", ".")
+        _git(repo, "-c", "user.email=test@example.com", "-c", "user.name=Test",
+             "commit", "-q", "-m", "init")
+
+        _git(repo, "mv", "old name.txt", "new name.txt")
+        (repo / "tracked file.txt").write_text("b\nc\n")
+        (repo / "staged file.txt").write_text("d\n")
+        _git(repo, "add", "staged file.txt")
+        (repo / "untracked file.txt").write_text("e\n")
+
+        result = git_status({"path": tmpdir})
+        assert not result.get("is_error", False)
+        sections = _status_sections(result["content"][0]["text"])
+
+        assert sections["Staged changes"] == ["staged file.txt"]
+        assert sections["Modified but not staged"] == ["tracked file.txt"]
+        assert sections["Untracked files"] == ["untracked file.txt"]
+        # Neither side of the rename is misread as a separate entry
+        listed = [path for paths in sections.values() for path in paths]
+        assert "new name.txt" not in listed
+        assert "old name.txt" not in listed
+
+
+def test_git_status_batch_keeps_input_order():
+    """Test batch git status ordering, section headers and error reporting."""
+    with (
+        tempfile.TemporaryDirectory() as dirty,
+        tempfile.TemporaryDirectory() as clean,
+        tempfile.TemporaryDirectory() as missing,
+    ):
+        _git(dirty, "init", "-q")
+        (Path(dirty) / "new.txt").write_text("x\n")
+        _git(clean, "init", "-q")
+
+        result = git_status_batch({"paths": [missing, dirty, clean]})
+        assert not result.get("is_error", False)
+        sections = result["content"][0]["text"].split("\n\n---\n\n")
+        assert len(sections) == 3
+
+        # Failing and clean paths get the same header as regular sections
+        assert sections[0].startswith(f"## Git Status: {missing}\n")
+        assert "Not a git repository" in sections[0]
+        assert sections[1].startswith(f"## Git Status: {Path(dirty).absolute()}\n")
+        assert "new.txt" in sections[1]
+        assert sections[2].startswith(f"## Git Status: {clean}\n")
+        assert "Working tree clean" in sections[2]
+
+        result = git_status_batch({"paths": [missing, missing]})
+        assert result.get("is_error", False)
@@ -48,7 +48,7 @@ class ExtendedFeatureState(TypedDict):
     review_passed: bool
 
     # 流程控制
-    iteration_count: int
+    iteration_count: Annotated[int, add]  # 验收节点返回增量
     max_iterations: int
     current_phase: str
 
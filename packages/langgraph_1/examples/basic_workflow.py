@@ -6,7 +6,6 @@
 """
 
 import os
-from langgraph_1 import FeatureDevelopmentGraph
 
 
 def main():
@@ -16,6 +15,9 @@ def main():
         print("请设置 ANTHROPIC_API_KEY 环境变量")
         return
 
+    # 检查通过后再导入，缺少 API key 时不必加载 langgraph 和模型客户端
+    from langgraph_1 import FeatureDevelopmentGraph
+
     # 创建工作流
     workflow = FeatureDevelopmentGraph()
 
@@ -73,6 +75,8 @@ def stream_example():
         print("请设置 ANTHROPIC_API_KEY 环境变量")
         return
 
+    from langgraph_1 import FeatureDevelopmentGraph
+
     workflow = FeatureDevelopmentGraph()
 
     requirement = "设计一个简单的待办事项列表，支持添加和删除任务"
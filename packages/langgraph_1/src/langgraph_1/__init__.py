@@ -5,10 +5,13 @@ LangGraph 多代理协作示例包。
 包含交互设计师和开发工程师的协作流程。
 """
 
-from .state import FeatureState
+from .state import AgentMessage, FeatureState
 from .graph import FeatureDevelopmentGraph
+from .cache import ResponseCache
 
 __all__ = [
+    "AgentMessage",
     "FeatureState",
     "FeatureDevelopmentGraph",
+    "ResponseCache",
 ]
@@ -6,24 +6,71 @@
 2. 验收开发成果是否符合设计
 """
 
+import hashlib
+import re
+from typing import Literal
+
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_anthropic import ChatAnthropic
+from pydantic import BaseModel, Field
+
+from ..client import get_llm
+from ..cache import ResponseCache, cached_invoke, acached_invoke
+from ..state import AgentMessage, FeatureState
+from ..prompts import (
+    DESIGNER_SYSTEM_PROMPT,
+    DESIGN_PROMPT,
+    REVIEW_SPEC_PROMPT,
+    REVIEW_CODE_PROMPT,
+    cached_text,
+)
+
+# Markdown 标题行：(井号, 标题文本)
+_SECTION_RE = re.compile(r"^(#+)\s*(.+?)\s*$", re.M)
+
+
+class ReviewIssue(BaseModel):
+    """验收发现的问题。"""
 
-from ..state import FeatureState
-from ..prompts import DESIGNER_SYSTEM_PROMPT, DESIGN_PROMPT, REVIEW_PROMPT
+    text: str = Field(description="具体问题和修改建议")
+    severity: Literal["blocker", "minor"] = Field(
+        description="blocker：不符合设计，必须修改；minor：可以改进，但不影响验收"
+    )
+
+
+class ReviewSchema(BaseModel):
+    """验收结果（结构化输出）。"""
+
+    passed: bool = Field(description="是否通过验收，存在 blocker 问题时为 false")
+    summary: str = Field(description="验收说明")
+    issues: list[ReviewIssue] = Field(default_factory=list, description="发现的问题")
 
 
 class InteractionDesigner:
     """交互设计师代理。"""
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        enable_cache: bool = False,
+        cache_seed: int | str | None = None,
+        semantic_cache=None,
+    ):
         """
         初始化交互设计师。
 
         Args:
             model: 使用的模型名称
+            enable_cache: 是否缓存模型响应，相同提示直接返回缓存结果
+            cache_seed: 缓存命名空间，用于隔离不同配置的缓存
+            semantic_cache: 设计结果的语义缓存（SemanticCache），需求相近时直接复用设计
         """
-        self.llm = ChatAnthropic(model=model, temperature=0.7)
+        self.llm = get_llm(model, 0.7)
+        self.cache = ResponseCache(seed=cache_seed) if enable_cache else None
+        self.semantic_cache = semantic_cache
+        # 验收使用结构化输出，直接得到结论和问题列表
+        self.review_llm = self.llm.with_structured_output(ReviewSchema)
+        # 已验收过的 (设计稿, 代码) -> 验收结果；代码未变时结论不会变，直接复用
+        self._review_memo: dict[str, ReviewSchema] = {}
 
     def design(self, state: FeatureState) -> dict:
         """
@@ -35,28 +82,38 @@ class InteractionDesigner:
         Returns:
             更新后的状态字段
         """
-        messages = [
-            SystemMessage(content=DESIGNER_SYSTEM_PROMPT),
-            HumanMessage(content=DESIGN_PROMPT.format(
-                requirement=state["requirement"]
-            )),
-        ]
+        cached = self._semantic_lookup(state)
+        if cached is not None:
+            return cached
 
-        response = self.llm.invoke(messages)
-        design_content = response.content
+        content = cached_invoke(self.llm, self.cache, self._design_messages(state))
+        return self.design_from_response(state, content)
 
-        # 解析设计内容（简化处理，实际可用结构化输出）
-        return {
-            "design_spec": design_content,
-            "user_flow": self._extract_section(design_content, "用户流程"),
-            "ui_layout": self._extract_section(design_content, "界面布局"),
-            "interaction_details": self._extract_section(design_content, "交互细节"),
-            "messages": [{
-                "role": "designer",
-                "phase": "design",
-                "content": design_content,
-            }],
-        }
+    async def adesign(self, state: FeatureState) -> dict:
+        """design 的异步版本，等待模型响应时让出事件循环。"""
+        cached = self._semantic_lookup(state)
+        if cached is not None:
+            return cached
+
+        content = await acached_invoke(self.llm, self.cache, self._design_messages(state))
+        return self.design_from_response(state, content)
+
+    def close(self) -> None:
+        """释放响应缓存占用的文件。"""
+        if self.cache is not None:
+            self.cache.close()
+
+    def cached_design(self, state: FeatureState) -> dict | None:
+        """批量运行用：语义缓存中相近需求的设计结果，未命中返回 None。"""
+        return self._semantic_lookup(state)
+
+    def design_request(self, state: FeatureState) -> list:
+        """批量运行用：设计阶段提交给模型的消息。"""
+        return self._design_messages(state)
+
+    def design_from_response(self, state: FeatureState, content: str) -> dict:
+        """将模型返回的设计内容整理为状态更新，并写入语义缓存。"""
+        return self._semantic_store(state, self._design_result(content))
 
     def review(self, state: FeatureState) -> dict:
         """
@@ -68,73 +125,150 @@ class InteractionDesigner:
         Returns:
             更新后的状态字段
         """
-        messages = [
-            SystemMessage(content=DESIGNER_SYSTEM_PROMPT),
-            HumanMessage(content=REVIEW_PROMPT.format(
-                design_spec=state["design_spec"],
-                code=state["code"],
+        key = self._review_key(state)
+        review = self._review_memo.get(key)
+        if review is None:
+            content = cached_invoke(
+                self.llm, self.cache, self._review_messages(state), self._fetch_review
+            )
+            review = self._review_memo[key] = ReviewSchema.model_validate_json(content)
+        return self._review_result(state, review)
+
+    async def areview(self, state: FeatureState) -> dict:
+        """review 的异步版本，等待模型响应时让出事件循环。"""
+        key = self._review_key(state)
+        review = self._review_memo.get(key)
+        if review is None:
+            content = await acached_invoke(
+                self.llm, self.cache, self._review_messages(state), self._afetch_review
+            )
+            review = self._review_memo[key] = ReviewSchema.model_validate_json(content)
+        return self._review_result(state, review)
+
+    def _review_key(self, state: FeatureState) -> str:
+        """验收备忘录的键：设计稿和代码的 BLAKE2b 摘要。"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(state["design_spec"].encode())
+        digest.update(b"\0")
+        digest.update(state["code"].encode())
+        return digest.hexdigest()
+
+    def _fetch_review(self, messages: list) -> str:
+        """获取结构化验收结果，序列化为 JSON 以便缓存。"""
+        return self.review_llm.invoke(messages).model_dump_json()
+
+    async def _afetch_review(self, messages: list) -> str:
+        """_fetch_review 的异步版本。"""
+        return (await self.review_llm.ainvoke(messages)).model_dump_json()
+
+    def _semantic_lookup(self, state: FeatureState) -> dict | None:
+        """在语义缓存中查找相近需求的设计结果。"""
+        if self.semantic_cache is None:
+            return None
+        cached = self.semantic_cache.get(state["requirement"])
+        return dict(cached) if cached is not None else None
+
+    def _semantic_store(self, state: FeatureState, result: dict) -> dict:
+        """将设计结果写入语义缓存。"""
+        if self.semantic_cache is not None:
+            self.semantic_cache.set(state["requirement"], result)
+        return result
+
+    def _design_messages(self, state: FeatureState) -> list:
+        """构造设计阶段的消息。"""
+        return [
+            SystemMessage(content=[cached_text(DESIGNER_SYSTEM_PROMPT)]),
+            HumanMessage(content=DESIGN_PROMPT.format(
+                requirement=state["requirement"]
             )),
         ]
 
-        response = self.llm.invoke(messages)
-        review_content = response.content
+    def _design_result(self, design_content: str) -> dict:
+        """将设计内容整理为状态更新。"""
+        # 解析设计内容（简化处理，实际可用结构化输出）
+        # 标题索引只建立一次，三个章节各做一次切片
+        index = self._build_section_index(design_content)
+        return {
+            "design_spec": design_content,
+            "user_flow": self._extract_section(design_content, index, "用户流程"),
+            "ui_layout": self._extract_section(design_content, index, "界面布局"),
+            "interaction_details": self._extract_section(design_content, index, "交互细节"),
+            "messages": [AgentMessage(
+                role="designer",
+                phase="design",
+                content=design_content,
+            )],
+        }
+
+    def _review_messages(self, state: FeatureState) -> list:
+        """构造验收阶段的消息。"""
+        # 系统提示和设计稿在多轮验收中不变，标记为缓存前缀；只有代码部分每轮重新处理
+        return [
+            SystemMessage(content=[cached_text(DESIGNER_SYSTEM_PROMPT)]),
+            HumanMessage(content=[
+                cached_text(REVIEW_SPEC_PROMPT.format(design_spec=state["design_spec"])),
+                {"type": "text", "text": REVIEW_CODE_PROMPT.format(code=state["code"])},
+            ]),
+        ]
 
-        # 判断是否通过
-        passed = self._check_passed(review_content)
+    def _review_result(self, state: FeatureState, review: ReviewSchema) -> dict:
+        """将验收结果整理为状态更新。"""
+        passed = review.passed
+        review_content = self._format_review(review)
 
         result = {
             "review_result": review_content,
             "review_passed": passed,
-            "iteration_count": state["iteration_count"] + 1,
-            "messages": [{
-                "role": "designer",
-                "phase": "review",
-                "content": review_content,
-                "passed": passed,
-            }],
+            "iteration_count": 1,  # 增量，由状态的 add 累加
+            "messages": [AgentMessage(
+                role="designer",
+                phase="review",
+                content=review_content,
+                passed=passed,
+            )],
         }
 
         # 如果未通过，添加反馈
         if not passed:
-            result["feedback"] = [self._extract_feedback(review_content)]
+            feedback = self._extract_feedback(review)
+            result["feedback"] = [feedback]
+            separator = "\n---\n" if state["feedback"] else ""
+            result["all_feedback_joined"] = separator + feedback
 
         return result
 
-    def _extract_section(self, content: str, section_name: str) -> str:
-        """从设计内容中提取指定章节。"""
-        lines = content.split("\n")
-        in_section = False
-        section_lines = []
-
-        for line in lines:
-            if section_name in line:
-                in_section = True
-                continue
-            if in_section:
-                # 遇到下一个章节标题时停止
-                if line.startswith("#") or line.startswith("##"):
-                    break
-                section_lines.append(line)
-
-        return "\n".join(section_lines).strip()
-
-    def _check_passed(self, review_content: str) -> bool:
-        """检查验收是否通过。"""
-        content_lower = review_content.lower()
-        # 检查明确的通过/不通过标记
-        if "不通过" in review_content or "未通过" in review_content:
-            return False
-        if "通过" in review_content:
-            return True
-        # 检查英文标记
-        if "rejected" in content_lower or "not approved" in content_lower:
-            return False
-        if "approved" in content_lower or "passed" in content_lower:
-            return True
-        return False
-
-    def _extract_feedback(self, review_content: str) -> str:
-        """从验收结果中提取反馈。"""
-        # 简化处理：返回整个验收结果作为反馈
-        # 实际可以更精细地提取问题列表
-        return review_content
+    def _build_section_index(self, content: str) -> dict[str, tuple[int, int]]:
+        """建立 {标题文本: (正文起点, 正文终点)} 索引，每个章节到下一个标题为止。"""
+        matches = list(_SECTION_RE.finditer(content))
+        index = {}
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            index.setdefault(match.group(2), (match.end(), end))
+        return index
+
+    def _extract_section(
+        self, content: str, index: dict[str, tuple[int, int]], section_name: str
+    ) -> str:
+        """从设计内容中提取指定章节（取第一个包含章节名的标题）。"""
+        for heading, (start, end) in index.items():
+            if section_name in heading:
+                return content[start:end].strip()
+        return ""
+
+    def _format_review(self, review: ReviewSchema) -> str:
+        """将结构化验收结果格式化为可读文本。"""
+        lines = [f"**验收结论：{'通过' if review.passed else '不通过'}**", "", review.summary]
+        if review.issues:
+            lines += ["", "问题："]
+            lines += [f"- [{issue.severity}] {issue.text}" for issue in review.issues]
+        return "\n".join(lines)
+
+    def _extract_feedback(self, review: ReviewSchema) -> str:
+        """从验收结果中提取反馈：只把必须修改的问题交给开发。"""
+        issues = [issue for issue in review.issues if issue.severity == "blocker"]
+        # 没有标为 blocker 的问题时退回全部问题，再没有则使用验收说明
+        if not issues:
+            issues = review.issues
+        if not issues:
+            return review.summary
+        return "\n".join(f"- {issue.text}" for issue in issues)
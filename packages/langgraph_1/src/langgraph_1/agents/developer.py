@@ -7,23 +7,38 @@
 """
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_anthropic import ChatAnthropic
 
-from ..state import FeatureState
-from ..prompts import DEVELOPER_SYSTEM_PROMPT, DEVELOP_PROMPT, REVISE_PROMPT
+from ..client import get_llm
+from ..cache import ResponseCache, cached_invoke, acached_invoke
+from ..state import AgentMessage, FeatureState
+from ..prompts import (
+    DEVELOPER_SYSTEM_PROMPT,
+    DEVELOP_PROMPT,
+    REVISE_CONTEXT_PROMPT,
+    REVISE_FEEDBACK_PROMPT,
+    cached_text,
+)
 
 
 class Developer:
     """开发工程师代理。"""
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        enable_cache: bool = False,
+        cache_seed: int | str | None = None,
+    ):
         """
         初始化开发工程师。
 
         Args:
             model: 使用的模型名称
+            enable_cache: 是否缓存模型响应，相同提示直接返回缓存结果
+            cache_seed: 缓存命名空间，用于隔离不同配置的缓存
         """
-        self.llm = ChatAnthropic(model=model, temperature=0.3)
+        self.llm = get_llm(model, 0.3)
+        self.cache = ResponseCache(seed=cache_seed) if enable_cache else None
 
     def implement(self, state: FeatureState) -> dict:
         """
@@ -35,16 +50,65 @@ class Developer:
         Returns:
             更新后的状态字段
         """
+        if self._feedback_unchanged(state):
+            return self._unchanged_result(state)
+
+        messages, phase = self._implement_messages(state)
+        content = cached_invoke(self.llm, self.cache, messages)
+        return self._code_result(state, phase, content)
+
+    async def aimplement(self, state: FeatureState) -> dict:
+        """implement 的异步版本，等待模型响应时让出事件循环。"""
+        if self._feedback_unchanged(state):
+            return self._unchanged_result(state)
+
+        messages, phase = self._implement_messages(state)
+        content = await acached_invoke(self.llm, self.cache, messages)
+        return self._code_result(state, phase, content)
+
+    def close(self) -> None:
+        """释放响应缓存占用的文件。"""
+        if self.cache is not None:
+            self.cache.close()
+
+    def implement_request(self, state: FeatureState) -> list:
+        """批量运行用：首次开发提交给模型的消息。"""
+        return self._initial_messages(state)
+
+    def implement_from_response(self, state: FeatureState, content: str) -> dict:
+        """批量运行用：将模型返回的首次开发代码整理为状态更新。"""
+        return self._code_result(state, "implement", content)
+
+    def _feedback_unchanged(self, state: FeatureState) -> bool:
+        """最新反馈与上一次相同（修改已无进展），无需再次调用模型。"""
+        feedback = state["feedback"]
+        return len(feedback) >= 2 and feedback[-1].strip() == feedback[-2].strip()
+
+    def _unchanged_result(self, state: FeatureState) -> dict:
+        """反馈未变化时保留当前代码。"""
+        return {
+            "code": state["code"],
+            "messages": [AgentMessage(
+                role="developer",
+                phase="revise",
+                iteration=state["iteration_count"],
+                content=state["code"],
+                skipped=True,
+            )],
+        }
+
+    def _implement_messages(self, state: FeatureState) -> tuple[list, str]:
+        """构造开发阶段的消息，返回 (消息, 阶段名)。"""
         # 检查是否是首次开发还是修改
         if state["iteration_count"] == 0:
-            return self._initial_implement(state)
+            return self._initial_messages(state), "implement"
         else:
-            return self._revise_implement(state)
+            return self._revise_messages(state), "revise"
 
-    def _initial_implement(self, state: FeatureState) -> dict:
-        """首次开发实现。"""
-        messages = [
-            SystemMessage(content=DEVELOPER_SYSTEM_PROMPT),
+    def _initial_messages(self, state: FeatureState) -> list:
+        """首次开发实现的消息。"""
+        return [
+            SystemMessage(content=[cached_text(DEVELOPER_SYSTEM_PROMPT)]),
             HumanMessage(content=DEVELOP_PROMPT.format(
                 design_spec=state["design_spec"],
                 user_flow=state["user_flow"],
@@ -53,43 +117,34 @@ class Developer:
             )),
         ]
 
-        response = self.llm.invoke(messages)
-        code_content = response.content
-
-        return {
-            "code": code_content,
-            "messages": [{
-                "role": "developer",
-                "phase": "implement",
-                "iteration": state["iteration_count"],
-                "content": code_content,
-            }],
-        }
-
-    def _revise_implement(self, state: FeatureState) -> dict:
-        """根据反馈修改实现。"""
+    def _revise_messages(self, state: FeatureState) -> list:
+        """根据反馈修改实现的消息。"""
         # 获取最新的反馈
         latest_feedback = state["feedback"][-1] if state["feedback"] else ""
 
-        messages = [
-            SystemMessage(content=DEVELOPER_SYSTEM_PROMPT),
-            HumanMessage(content=REVISE_PROMPT.format(
-                design_spec=state["design_spec"],
-                previous_code=state["code"],
-                feedback=latest_feedback,
-                all_feedback="\n---\n".join(state["feedback"]),
-            )),
+        # 系统提示、设计稿和当前代码作为缓存前缀，只有反馈部分不缓存
+        return [
+            SystemMessage(content=[cached_text(DEVELOPER_SYSTEM_PROMPT)]),
+            HumanMessage(content=[
+                cached_text(REVISE_CONTEXT_PROMPT.format(
+                    design_spec=state["design_spec"],
+                    previous_code=state["code"],
+                )),
+                {"type": "text", "text": REVISE_FEEDBACK_PROMPT.format(
+                    feedback=latest_feedback,
+                    all_feedback=state["all_feedback_joined"],
+                )},
+            ]),
         ]
 
-        response = self.llm.invoke(messages)
-        code_content = response.content
-
+    def _code_result(self, state: FeatureState, phase: str, code_content: str) -> dict:
+        """将代码内容整理为状态更新。"""
         return {
             "code": code_content,
-            "messages": [{
-                "role": "developer",
-                "phase": "revise",
-                "iteration": state["iteration_count"],
-                "content": code_content,
-            }],
+            "messages": [AgentMessage(
+                role="developer",
+                phase=phase,
+                iteration=state["iteration_count"],
+                content=code_content,
+            )],
         }
@@ -0,0 +1,93 @@
+"""
+批量执行模块。
+
+通过 Anthropic Message Batches API 一次提交多个相互独立的模型请求，
+成本约为逐条调用的一半，适合多需求批量运行时的设计和首次开发阶段。
+"""
+
+import time
+from typing import Optional
+
+
+def to_batch_params(llm, messages: list) -> dict:
+    """
+    将 ChatAnthropic 及其消息转换为批量请求的 params。
+
+    Args:
+        llm: ChatAnthropic 实例，提供模型、温度和最大 token 数
+        messages: [SystemMessage, HumanMessage, ...] 消息列表
+
+    Returns:
+        Messages API 请求参数
+    """
+    system = [m.content for m in messages if m.type == "system"]
+    params = {
+        "model": llm.model,
+        "max_tokens": llm.max_tokens,
+        "temperature": llm.temperature,
+        "messages": [
+            {"role": "user" if m.type == "human" else "assistant", "content": m.content}
+            for m in messages
+            if m.type != "system"
+        ],
+    }
+    if system:
+        params["system"] = system[0]
+    return params
+
+
+class BatchExecutor:
+    """
+    Message Batches 执行器。
+
+    提交一批请求，轮询直到批次处理结束，再按 custom_id 取回各自的结果。
+    """
+
+    def __init__(
+        self,
+        client=None,
+        poll_interval: float = 10.0,
+    ):
+        """
+        初始化批量执行器。
+
+        Args:
+            client: anthropic.Anthropic 客户端，为 None 时使用默认配置创建
+            poll_interval: 轮询批次状态的间隔（秒）
+        """
+        if client is None:
+            import anthropic
+
+            client = anthropic.Anthropic()
+        self.client = client
+        self.poll_interval = poll_interval
+
+    def run(self, requests: list[dict]) -> list[Optional[str]]:
+        """
+        执行一批请求。
+
+        Args:
+            requests: 请求参数列表（见 to_batch_params）
+
+        Returns:
+            与 requests 一一对应的响应文本，失败、过期或取消的请求为 None
+        """
+        if not requests:
+            return []
+
+        batch = self.client.messages.batches.create(requests=[
+            {"custom_id": str(i), "params": params}
+            for i, params in enumerate(requests)
+        ])
+        while batch.processing_status != "ended":
+            time.sleep(self.poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        # 结果不保证按提交顺序返回，按 custom_id 还原
+        results: list[Optional[str]] = [None] * len(requests)
+        for item in self.client.messages.batches.results(batch.id):
+            if item.result.type == "succeeded":
+                results[int(item.custom_id)] = "".join(
+                    block.text for block in item.result.message.content if block.type == "text"
+                )
+        return results
@@ -0,0 +1,133 @@
+"""
+响应缓存模块。
+
+按提示内容精确匹配缓存模型响应，相同输入的重复运行不再调用模型。
+"""
+
+import hashlib
+import json
+import shelve
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库
+    orjson = None
+
+
+class ResponseCache:
+    """
+    模型响应缓存。
+
+    键为全部消息 (类型, 内容) 的 SHA-256，值为响应文本。
+    默认保存在进程内存中（LRU 淘汰）；指定 path 时改用 shelve 文件持久化，
+    用完需调用 close()（或用作上下文管理器）写回并释放文件。
+    接口只有 get/set/close，可替换为 redis 等同接口的实现。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        seed: Optional[int | str] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        初始化响应缓存。
+
+        Args:
+            maxsize: 内存缓存的最大条目数
+            seed: 缓存命名空间，不同 seed 的键互不命中
+            path: shelve 文件路径，为 None 时只缓存在内存中
+        """
+        self.maxsize = maxsize
+        self.seed = seed
+        self._store = shelve.open(path) if path else None
+        self._memory: OrderedDict[str, str] = OrderedDict()
+
+    def key(self, messages: list) -> str:
+        """根据消息列表计算缓存键。"""
+        payload = [self.seed, [[m.type, m.content] for m in messages]]
+        return hashlib.sha256(_dumps(payload)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存，未命中返回 None。"""
+        if self._store is not None:
+            return self._store.get(key)
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """写入缓存。"""
+        if self._store is not None:
+            self._store[key] = value
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        """关闭 shelve 文件，写回未落盘的条目；只用内存时无操作，可重复调用。"""
+        if self._store is not None:
+            self._store.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _dumps(payload) -> bytes:
+    """紧凑 JSON 编码；orjson 与标准库输出一致，缓存键不受是否安装 orjson 影响。"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def cached_invoke(
+    llm,
+    cache: Optional[ResponseCache],
+    messages: list,
+    fetch: Optional[Callable[[list], str]] = None,
+) -> str:
+    """
+    调用模型并返回响应文本，命中缓存时跳过模型调用。
+
+    fetch 可替换实际的取数方式（例如流式读取），默认为 llm.invoke(messages).content。
+    """
+    if fetch is None:
+        fetch = lambda m: llm.invoke(m).content
+    if cache is None:
+        return fetch(messages)
+
+    key = cache.key(messages)
+    content = cache.get(key)
+    if content is None:
+        content = fetch(messages)
+        cache.set(key, content)
+    return content
+
+
+async def acached_invoke(
+    llm,
+    cache: Optional[ResponseCache],
+    messages: list,
+    fetch: Optional[Callable[[list], Awaitable[str]]] = None,
+) -> str:
+    """cached_invoke 的异步版本。"""
+    if fetch is None:
+        async def fetch(m):
+            return (await llm.ainvoke(m)).content
+    if cache is None:
+        return await fetch(messages)
+
+    key = cache.key(messages)
+    content = cache.get(key)
+    if content is None:
+        content = await fetch(messages)
+        cache.set(key, content)
+    return content
@@ -0,0 +1,34 @@
+"""
+模型客户端模块。
+
+按 (模型, 温度) 共享 ChatAnthropic 实例，避免每次创建代理或工作流图都重新初始化客户端。
+"""
+
+from functools import lru_cache
+
+from .prompts import PROMPT_CACHING_HEADERS
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str, temperature: float):
+    """
+    获取共享的 ChatAnthropic 实例。
+
+    ChatAnthropic 不保存会话状态，可以在多个代理和工作流图之间复用；
+    复用同一实例即复用其底层 HTTP 客户端和连接池（TLS 握手、keep-alive 连接）。
+
+    Args:
+        model: 模型名称
+        temperature: 采样温度
+
+    Returns:
+        ChatAnthropic 实例
+    """
+    # 首次创建代理时才导入（anthropic SDK、httpx 等加载较慢）
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(
+        model=model,
+        temperature=temperature,
+        model_kwargs={"extra_headers": PROMPT_CACHING_HEADERS},
+    )
@@ -4,12 +4,56 @@
 使用 LangGraph 定义功能开发的工作流程。
 """
 
-from typing import Literal
+import asyncio
+from typing import Annotated, Literal, Optional, get_origin, get_type_hints
 
-from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
 from .state import FeatureState, create_initial_state
 from .agents import InteractionDesigner, Developer
+from .batch import BatchExecutor, to_batch_params
+
+
+# FeatureState 中以 Annotated 声明了归并函数的字段，与 LangGraph 合并节点输出的方式一致
+_REDUCERS = {
+    key: hint.__metadata__[0]
+    for key, hint in get_type_hints(FeatureState, include_extras=True).items()
+    if get_origin(hint) is Annotated
+}
+
+
+def _apply_update(state: FeatureState, update: dict) -> None:
+    """将节点输出合并到状态中（有归并函数的字段归并，其余覆盖），用于在图外预先执行的阶段。"""
+    for key, value in update.items():
+        reducer = _REDUCERS.get(key)
+        state[key] = reducer(state[key], value) if reducer is not None else value
+
+
+def _run_cached_batch(
+    executor: BatchExecutor, llm, cache, message_lists: list[list]
+) -> list[Optional[str]]:
+    """
+    批量执行请求，与 cached_invoke 共用响应缓存。
+
+    命中缓存的请求不再提交，只有未命中的部分进入批次；成功的响应写回缓存。
+
+    Returns:
+        与 message_lists 一一对应的响应文本，批量中失败的请求为 None
+    """
+    if cache is None:
+        keys, results = [], [None] * len(message_lists)
+    else:
+        keys = [cache.key(messages) for messages in message_lists]
+        results = [cache.get(key) for key in keys]
+
+    pending = [i for i, content in enumerate(results) if content is None]
+    fetched = executor.run([to_batch_params(llm, message_lists[i]) for i in pending])
+    for i, content in zip(pending, fetched):
+        if content is not None:
+            results[i] = content
+            if cache is not None:
+                cache.set(keys[i], content)
+    return results
 
 
 class FeatureDevelopmentGraph:
@@ -27,12 +71,18 @@ class FeatureDevelopmentGraph:
                        ↑         ↓
                        ←── 不通过 ←
     ```
+
+    图的结构与模型配置无关，每个类只编译一次并在实例间共享；
+    节点通过运行配置（configurable）取得当前实例的代理。
     """
 
     def __init__(
         self,
         designer_model: str = "claude-sonnet-4-20250514",
         developer_model: str = "claude-sonnet-4-20250514",
+        enable_cache: bool = False,
+        cache_seed: int | str | None = None,
+        semantic_cache=None,
     ):
         """
         初始化工作流图。
@@ -40,23 +90,59 @@ class FeatureDevelopmentGraph:
         Args:
             designer_model: 交互设计师使用的模型
             developer_model: 开发工程师使用的模型
+            enable_cache: 是否缓存模型响应（开发调试和回归运行时避免重复调用）
+            cache_seed: 缓存命名空间，例如按 max_iterations 等配置区分
+            semantic_cache: 设计节点的语义缓存（SemanticCache）
         """
-        self.designer = InteractionDesigner(model=designer_model)
-        self.developer = Developer(model=developer_model)
-        self.graph = self._build_graph()
-
-    def _build_graph(self) -> StateGraph:
+        self.designer = InteractionDesigner(
+            model=designer_model,
+            enable_cache=enable_cache,
+            cache_seed=cache_seed,
+            semantic_cache=semantic_cache,
+        )
+        self.developer = Developer(
+            model=developer_model, enable_cache=enable_cache, cache_seed=cache_seed
+        )
+        self.graph = self._compiled_graph()
+
+        # 随每次执行传给图的配置，节点从中取得本实例的代理
+        self._config: RunnableConfig = {
+            "configurable": {"designer": self.designer, "developer": self.developer},
+        }
+
+    @classmethod
+    def _compiled_graph(cls):
+        """获取本类已编译的工作流图，首次调用时构建。"""
+        # 只查本类自己的属性，子类重写 _build_graph 时各自编译
+        compiled = cls.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = cls._build_graph()
+            cls._compiled = compiled
+        return compiled
+
+    @classmethod
+    def _build_graph(cls):
         """构建工作流图。"""
+        # langgraph 在首次构建时才导入，只导入本包（如查看帮助、缺少 API key 提前退出）时不必加载
+        from langgraph.graph import StateGraph, END
+
         # 创建状态图
         graph = StateGraph(FeatureState)
 
-        # 添加节点
-        graph.add_node("design", self._design_node)
-        graph.add_node("develop", self._develop_node)
-        graph.add_node("review", self._review_node)
+        # 添加节点（同时提供同步和异步实现，run 走 invoke，arun 走 ainvoke）
+        graph.add_node("design", RunnableLambda(cls._design_node, afunc=cls._adesign_node))
+        graph.add_node("develop", RunnableLambda(cls._develop_node, afunc=cls._adevelop_node))
+        graph.add_node("review", RunnableLambda(cls._review_node, afunc=cls._areview_node))
 
-        # 设置入口点
-        graph.set_entry_point("design")
+        # 设置入口点（跳过已在图外完成的阶段）
+        graph.set_conditional_entry_point(
+            cls._entry_router,
+            {
+                "design": "design",
+                "develop": "develop",
+                "review": "review",
+            },
+        )
 
         # 添加边
         graph.add_edge("design", "develop")
@@ -65,7 +151,7 @@ class FeatureDevelopmentGraph:
         # 添加条件边（验收后的路由）
         graph.add_conditional_edges(
             "review",
-            self._review_router,
+            cls._review_router,
             {
                 "revise": "develop",  # 不通过，返回开发
                 "complete": END,       # 通过，结束
@@ -74,19 +160,52 @@ class FeatureDevelopmentGraph:
 
         return graph.compile()
 
-    def _design_node(self, state: FeatureState) -> dict:
+    @staticmethod
+    def _design_node(state: FeatureState, config: RunnableConfig) -> dict:
         """设计节点：交互设计师创建设计。"""
-        return self.designer.design(state)
+        return config["configurable"]["designer"].design(state)
 
-    def _develop_node(self, state: FeatureState) -> dict:
+    @staticmethod
+    def _develop_node(state: FeatureState, config: RunnableConfig) -> dict:
         """开发节点：开发工程师实现代码。"""
-        return self.developer.implement(state)
+        return config["configurable"]["developer"].implement(state)
 
-    def _review_node(self, state: FeatureState) -> dict:
+    @staticmethod
+    def _review_node(state: FeatureState, config: RunnableConfig) -> dict:
         """验收节点：交互设计师验收成果。"""
-        return self.designer.review(state)
+        return config["configurable"]["designer"].review(state)
+
+    @staticmethod
+    async def _adesign_node(state: FeatureState, config: RunnableConfig) -> dict:
+        """设计节点（异步）。"""
+        return await config["configurable"]["designer"].adesign(state)
+
+    @staticmethod
+    async def _adevelop_node(state: FeatureState, config: RunnableConfig) -> dict:
+        """开发节点（异步）。"""
+        return await config["configurable"]["developer"].aimplement(state)
 
-    def _review_router(self, state: FeatureState) -> Literal["revise", "complete"]:
+    @staticmethod
+    async def _areview_node(state: FeatureState, config: RunnableConfig) -> dict:
+        """验收节点（异步）。"""
+        return await config["configurable"]["designer"].areview(state)
+
+    @staticmethod
+    def _entry_router(state: FeatureState) -> Literal["design", "develop", "review"]:
+        """
+        入口路由逻辑。
+
+        单次运行从设计开始；批量运行时设计和首次开发已通过批量接口完成，
+        直接从尚未完成的阶段开始。
+        """
+        if not state["design_spec"]:
+            return "design"
+        if not state["code"]:
+            return "develop"
+        return "review"
+
+    @staticmethod
+    def _review_router(state: FeatureState) -> Literal["revise", "complete"]:
         """
         验收后的路由逻辑。
 
@@ -128,7 +247,7 @@ class FeatureDevelopmentGraph:
         )
 
         # 执行图
-        result = self.graph.invoke(initial_state)
+        result = self.graph.invoke(initial_state, self._config)
         return result
 
     async def arun(
@@ -151,10 +270,88 @@ class FeatureDevelopmentGraph:
             max_iterations=max_iterations,
         )
 
-        # 异步执行图
-        result = await self.graph.ainvoke(initial_state)
+        # 异步执行图，各节点使用异步模型调用，多个工作流可在同一事件循环中并发运行
+        result = await self.graph.ainvoke(initial_state, self._config)
         return result
 
+    def run_batch(
+        self,
+        requirements: list[str],
+        max_iterations: int = 3,
+        batch_executor: BatchExecutor | None = None,
+    ) -> list[FeatureState]:
+        """
+        批量运行多个需求的工作流，见 arun_batch。
+
+        Args:
+            requirements: 需求描述列表
+            max_iterations: 最大迭代次数
+            batch_executor: 批量执行器，为 None 时使用默认配置创建
+
+        Returns:
+            与 requirements 一一对应的最终状态
+        """
+        return asyncio.run(self.arun_batch(requirements, max_iterations, batch_executor))
+
+    async def arun_batch(
+        self,
+        requirements: list[str],
+        max_iterations: int = 3,
+        batch_executor: BatchExecutor | None = None,
+    ) -> list[FeatureState]:
+        """
+        批量运行多个需求的工作流。
+
+        各需求的设计和首次开发相互独立，分别通过 Message Batches API 一次提交；
+        之后的验收/修改循环按需求并发执行。批量中失败的请求回到图中逐个重做。
+        与单次运行一样先查语义缓存和响应缓存，命中的请求不进入批次。
+
+        Args:
+            requirements: 需求描述列表
+            max_iterations: 最大迭代次数
+            batch_executor: 批量执行器，为 None 时使用默认配置创建
+
+        Returns:
+            与 requirements 一一对应的最终状态
+        """
+        executor = batch_executor or BatchExecutor()
+        states = [create_initial_state(r, max_iterations) for r in requirements]
+
+        # 设计阶段：语义缓存命中的直接复用，其余批量提交
+        undesigned = []
+        for state in states:
+            cached = self.designer.cached_design(state)
+            if cached is not None:
+                _apply_update(state, cached)
+            else:
+                undesigned.append(state)
+        designs = await asyncio.to_thread(
+            _run_cached_batch,
+            executor,
+            self.designer.llm,
+            self.designer.cache,
+            [self.designer.design_request(state) for state in undesigned],
+        )
+        for state, content in zip(undesigned, designs):
+            if content is not None:
+                _apply_update(state, self.designer.design_from_response(state, content))
+
+        # 首次开发阶段：对设计已完成的需求批量提交
+        designed = [state for state in states if state["design_spec"]]
+        codes = await asyncio.to_thread(
+            _run_cached_batch,
+            executor,
+            self.developer.llm,
+            self.developer.cache,
+            [self.developer.implement_request(state) for state in designed],
+        )
+        for state, content in zip(designed, codes):
+            if content is not None:
+                _apply_update(state, self.developer.implement_from_response(state, content))
+
+        # 验收/修改循环：各需求并发执行
+        return list(await asyncio.gather(*(self.graph.ainvoke(state, self._config) for state in states)))
+
     def stream(
         self,
         requirement: str,
@@ -176,9 +373,20 @@ class FeatureDevelopmentGraph:
         )
 
         # 流式执行
-        for event in self.graph.stream(initial_state):
+        for event in self.graph.stream(initial_state, self._config):
             yield event
 
+    def close(self) -> None:
+        """关闭两个代理的响应缓存。"""
+        self.designer.close()
+        self.developer.close()
+
+    def __enter__(self) -> "FeatureDevelopmentGraph":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def get_graph_image(self):
         """
         获取工作流图的可视化。
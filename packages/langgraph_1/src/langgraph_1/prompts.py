@@ -53,11 +53,14 @@ DESIGN_PROMPT = """请根据以下需求设计交互方案：
 解释关键设计决策的原因。
 """
 
-REVIEW_PROMPT = """请验收以下开发成果是否符合交互设计：
+# 验收提示词按缓存边界拆成两段：设计稿部分在多轮验收中不变，可走提示缓存
+REVIEW_SPEC_PROMPT = """请验收以下开发成果是否符合交互设计：
 
 ## 原始设计
 {design_spec}
+"""
 
+REVIEW_CODE_PROMPT = """
 ## 开发代码
 ```
 {code}
@@ -73,11 +76,18 @@ REVIEW_PROMPT = """请验收以下开发成果是否符合交互设计：
 
 ## 验收结果
 
-请给出明确的验收结论：
-- 如果符合设计要求，请标注"**验收结论：通过**"
-- 如果不符合，请标注"**验收结论：不通过**"，并列出具体问题和修改建议
+请给出：
+- 明确的验收结论（是否通过）
+- 简要的验收说明
+- 发现的问题列表，每个问题写明具体问题和修改建议，并标注严重程度：
+  - blocker：不符合设计，必须修改
+  - minor：可以改进，但不影响验收
+
+存在 blocker 问题时验收不通过。
 """
 
+REVIEW_PROMPT = REVIEW_SPEC_PROMPT + REVIEW_CODE_PROMPT
+
 
 # =============================================================================
 # 开发工程师提示词
@@ -132,7 +142,8 @@ DEVELOP_PROMPT = """请根据以下交互设计实现功能：
 请输出完整的实现代码。
 """
 
-REVISE_PROMPT = """请根据验收反馈修改代码：
+# 修改提示词同样拆分：设计稿和当前代码作为缓存前缀，反馈部分每轮变化
+REVISE_CONTEXT_PROMPT = """请根据验收反馈修改代码：
 
 ## 原始设计
 {design_spec}
@@ -141,7 +152,9 @@ REVISE_PROMPT = """请根据验收反馈修改代码：
 ```
 {previous_code}
 ```
+"""
 
+REVISE_FEEDBACK_PROMPT = """
 ## 最新反馈
 {feedback}
 
@@ -158,3 +171,18 @@ REVISE_PROMPT = """请根据验收反馈修改代码：
 
 请输出修改后的完整代码。
 """
+
+REVISE_PROMPT = REVISE_CONTEXT_PROMPT + REVISE_FEEDBACK_PROMPT
+
+
+# =============================================================================
+# 提示缓存
+# =============================================================================
+
+# Anthropic 提示缓存的 beta 请求头，通过 ChatAnthropic(model_kwargs=...) 传入
+PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+
+def cached_text(text: str) -> dict:
+    """构造带 cache_control 标记的文本块，该块及之前的内容作为缓存前缀。"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
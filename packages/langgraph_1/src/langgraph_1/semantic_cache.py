@@ -0,0 +1,96 @@
+"""
+语义缓存模块。
+
+按需求描述的语义相似度缓存设计结果：措辞不同但含义相近的需求直接复用已有设计。
+依赖 numpy，默认嵌入模型依赖 sentence-transformers（pip install "langgraph_1[semantic]"）。
+"""
+
+import pickle
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+# 默认嵌入模型（384 维）
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class SemanticCache:
+    """
+    语义缓存。
+
+    所有键的归一化嵌入存放在一个 float32 矩阵（N × 维度）中，
+    查找时一次矩阵乘法算出与全部键的余弦相似度，取最大值与阈值比较。
+    """
+
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        threshold: float = 0.92,
+    ):
+        """
+        初始化语义缓存。
+
+        Args:
+            embed: 文本嵌入函数，为 None 时首次使用才加载默认的 SBERT 模型
+            threshold: 命中所需的最小余弦相似度
+        """
+        self._embed = embed
+        self.threshold = threshold
+        self._matrix: Optional[np.ndarray] = None
+        self._values: list = []
+        # 最近一次嵌入的文本，get 未命中后紧接着 set 时不必重复计算
+        self._last: tuple[str, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, text: str):
+        """查找语义相近的缓存值，未命中返回 None。"""
+        if self._matrix is None:
+            return None
+        scores = self._matrix @ self._embedding(text)
+        best = int(scores.argmax())
+        if scores[best] >= self.threshold:
+            return self._values[best]
+        return None
+
+    def set(self, text: str, value) -> None:
+        """写入缓存。"""
+        row = self._embedding(text)[np.newaxis, :]
+        self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+        self._values.append(value)
+
+    def save(self, path: str) -> None:
+        """将缓存保存到文件。"""
+        with open(path, "wb") as f:
+            pickle.dump({"matrix": self._matrix, "values": self._values}, f)
+
+    def load(self, path: str) -> None:
+        """从文件加载缓存，替换当前内容。"""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        self._matrix = data["matrix"]
+        self._values = data["values"]
+
+    def _embedding(self, text: str) -> np.ndarray:
+        """计算归一化的 float32 嵌入向量。"""
+        if self._last is not None and self._last[0] == text:
+            return self._last[1]
+
+        if self._embed is None:
+            self._embed = _default_embedder()
+        vector = np.asarray(self._embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+
+        self._last = (text, vector)
+        return vector
+
+
+def _default_embedder() -> Callable[[str], Sequence[float]]:
+    """加载默认的 sentence-transformers 嵌入模型。"""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(DEFAULT_EMBEDDING_MODEL)
+    return model.encode
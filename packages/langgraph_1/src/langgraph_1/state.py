@@ -4,9 +4,46 @@
 定义工作流中共享的状态结构。
 """
 
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Literal
 from operator import add
 
+from pydantic import BaseModel, ConfigDict
+
+
+def _append(a: list, b: list) -> list:
+    """
+    历史记录的累加函数：原地扩展已有列表。
+
+    与 operator.add 不同，不会每次合并都复制整个历史，合并代价只与新增条目数有关。
+    状态中的列表由 LangGraph 持有并被原地修改，外部不应保留其引用作为快照。
+    """
+    a.extend(b)
+    return a
+
+
+class AgentMessage(BaseModel):
+    """消息历史中的一条记录。"""
+
+    model_config = ConfigDict(frozen=True)
+
+    role: Literal["designer", "developer"]
+    """产生消息的角色"""
+
+    phase: str
+    """所处阶段：design / review / implement / revise"""
+
+    content: str
+    """消息内容"""
+
+    iteration: int | None = None
+    """开发消息所在的迭代次数"""
+
+    passed: bool | None = None
+    """验收消息的结论"""
+
+    skipped: bool = False
+    """反馈未变化、未调用模型而沿用当前代码"""
+
 
 class FeatureState(TypedDict):
     """功能开发工作流的状态。"""
@@ -40,19 +77,22 @@ class FeatureState(TypedDict):
     """是否通过验收"""
 
     # 流程控制
-    iteration_count: int
-    """迭代次数"""
+    iteration_count: Annotated[int, add]
+    """迭代次数（节点返回增量，由 add 累加）"""
 
     max_iterations: int
     """最大迭代次数"""
 
-    # 历史记录（使用 Annotated 支持累加）
-    feedback: Annotated[list[str], add]
+    # 历史记录（使用 Annotated 支持累加，原地追加）
+    feedback: Annotated[list[str], _append]
     """反馈历史，每次验收不通过时累加"""
 
-    messages: Annotated[list[dict], add]
+    messages: Annotated[list[AgentMessage], _append]
     """消息历史，记录所有交互"""
 
+    all_feedback_joined: Annotated[str, add]
+    """以分隔线连接的全部反馈，随反馈累加，修改时直接使用而不必每轮重新拼接"""
+
 
 def create_initial_state(requirement: str, max_iterations: int = 3) -> FeatureState:
     """
@@ -78,4 +118,5 @@ def create_initial_state(requirement: str, max_iterations: int = 3) -> FeatureSt
         max_iterations=max_iterations,
         feedback=[],
         messages=[],
+        all_feedback_joined="",
     )
@@ -0,0 +1 @@
+"""langgraph_1 测试。"""
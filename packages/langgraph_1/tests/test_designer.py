@@ -0,0 +1,121 @@
+"""
+交互设计师验收逻辑的测试。
+
+使用按顺序返回预设验收结果的假模型，不调用真实 API。
+"""
+
+import pytest
+
+from langgraph_1.agents import designer as designer_module
+from langgraph_1.agents.designer import InteractionDesigner, ReviewIssue, ReviewSchema
+from langgraph_1.state import create_initial_state
+
+
+class FakeLLM:
+    """假模型：结构化输出时依次返回预设的验收结果。"""
+
+    def __init__(self, reviews: list[ReviewSchema]):
+        self.reviews = list(reviews)
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, messages):
+        return self.reviews.pop(0)
+
+
+@pytest.fixture
+def make_designer(monkeypatch):
+    """创建使用假模型的交互设计师。"""
+
+    def make(*reviews: ReviewSchema) -> InteractionDesigner:
+        fake = FakeLLM(reviews)
+        monkeypatch.setattr(designer_module, "get_llm", lambda model, temperature: fake)
+        return InteractionDesigner()
+
+    return make
+
+
+def _state(code: str = "print('v1')", feedback: list[str] | None = None):
+    """已完成设计和开发、等待验收的状态。"""
+    state = create_initial_state("登录页面")
+    state["design_spec"] = "## 用户流程\n输入账号密码后登录"
+    state["code"] = code
+    state["feedback"] = feedback or []
+    return state
+
+
+def test_review_feeds_only_blocker_issues(make_designer):
+    """测试反馈只包含 blocker 问题，minor 问题仅出现在验收结果中。"""
+    review = ReviewSchema(
+        passed=False,
+        summary="缺少错误提示",
+        issues=[
+            ReviewIssue(text="密码错误时没有提示", severity="blocker"),
+            ReviewIssue(text="按钮颜色可以更醒目", severity="minor"),
+        ],
+    )
+    designer = make_designer(review)
+
+    result = designer.review(_state())
+    assert result["feedback"] == ["- 密码错误时没有提示"]
+    assert "按钮颜色可以更醒目" in result["review_result"]
+
+
+def test_review_feedback_falls_back_to_summary(make_designer):
+    """测试没有 blocker 时退回全部问题，没有问题时使用验收说明。"""
+    minor_only = ReviewSchema(
+        passed=False,
+        summary="需要调整",
+        issues=[ReviewIssue(text="文案不统一", severity="minor")],
+    )
+    no_issues = ReviewSchema(passed=False, summary="整体流程与设计不符", issues=[])
+    designer = make_designer(minor_only, no_issues)
+
+    result = designer.review(_state("v1"))
+    assert result["feedback"] == ["- 文案不统一"]
+
+    result = designer.review(_state("v2"))
+    assert result["feedback"] == ["整体流程与设计不符"]
+
+
+def test_all_feedback_joined_separator(make_designer):
+    """测试分隔线只在已有反馈时添加。"""
+    first = ReviewSchema(
+        passed=False,
+        summary="不通过",
+        issues=[ReviewIssue(text="缺少登录按钮", severity="blocker")],
+    )
+    second = ReviewSchema(
+        passed=False,
+        summary="不通过",
+        issues=[ReviewIssue(text="缺少错误提示", severity="blocker")],
+    )
+    designer = make_designer(first, second)
+
+    result = designer.review(_state("v1"))
+    assert result["all_feedback_joined"] == "- 缺少登录按钮"
+
+    result = designer.review(_state("v2", feedback=["- 缺少登录按钮"]))
+    assert result["all_feedback_joined"] == "\n---\n- 缺少错误提示"
+
+
+def test_review_counts_one_iteration(make_designer):
+    """测试每次验收无论结论如何都只记一次迭代，通过时不产生反馈。"""
+    rejected = ReviewSchema(
+        passed=False,
+        summary="不通过",
+        issues=[ReviewIssue(text="缺少登录按钮", severity="blocker")],
+    )
+    accepted = ReviewSchema(passed=True, summary="符合设计")
+    designer = make_designer(rejected, accepted)
+
+    result = designer.review(_state("v1"))
+    assert result["iteration_count"] == 1
+    assert result["review_passed"] is False
+
+    result = designer.review(_state("v2"))
+    assert result["iteration_count"] == 1
+    assert result["review_passed"] is True
+    assert "feedback" not in result
+    assert "all_feedback_joined" not in result